@@ -1,6 +1,19 @@
+import logging
 import streamlit as st
-from loaders.projects_loader import load_projects
+from loaders.projects_loader import load_projects, get_catalog
+from loaders.snapshot import default_snapshot_path
+from loaders.search_index import ProjectIndex
+from loaders.portfolio_stats import PortfolioStats, load_metric_config
+from loaders.routing import ProjectRoutes
 from components.layout import render_project_page, render_home, add_sidebar_navigation
+from components.figure_cache import figure_cache
+from components.dataset_registry import dataset_registry
+from components.prewarm import start_prewarm, prewarm_status
+from components.instrumentation import (
+    metrics, timer, export_rerun, start_profile, profile_report, profile_sampled
+)
+
+logger = logging.getLogger(__name__)
 
 st.set_page_config(
     page_title="Analytics Projects Portfolio",
@@ -9,8 +22,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Per-rerun timers; ?profile=1 (or PORTFOLIO_PROFILE_SAMPLE) runs this rerun under cProfile
+metrics.start_rerun("project" if "project" in st.query_params else "home")
+profile_requested = "profile" in st.query_params
+profiler = start_profile() if profile_requested or profile_sampled() else None
+
+try:
+    # Custom CSS for better styling
+    st.markdown("""
 <style>
 /* Hide default Streamlit elements */
 #MainMenu {visibility: hidden;}
@@ -62,77 +81,161 @@ header {visibility: hidden;}
 </style>
 """, unsafe_allow_html=True)
 
-# Load projects
-projects = load_projects("data/projects")
+    PROJECTS_DIR = "data/projects"
+    METRICS_CONFIG = "data/portfolio.yaml"
 
-# Add sidebar navigation
-add_sidebar_navigation(projects)
+    # Load projects (cached per process; only changed files are re-parsed).
+    # A compiled snapshot, when present, replaces YAML parsing on cold start.
+    with timer("load_projects"):
+        projects = load_projects(PROJECTS_DIR, snapshot=default_snapshot_path(PROJECTS_DIR))
+    catalog = get_catalog(PROJECTS_DIR)
 
-# Filter functionality in sidebar
-with st.sidebar:
-    st.markdown("---")
-    st.markdown("### 🔍 Filters")
+    # Tag bitsets and search postings, rebuilt only when the catalog changes
+    index = catalog.derived("search_index", ProjectIndex)
 
-    # Get all unique tags
-    all_tags = sorted({t for p in projects for t in p.get("tags", [])})
+    # Validated key -> project map (with aliases) for deep links
+    routes = catalog.derived("routes", ProjectRoutes)
 
-    # Tag filter
-    selected_tags = st.multiselect("Filter by Technology", options=all_tags, key="tag_filter")
+    # Overview numbers, updated incrementally as project files change
+    portfolio_stats = catalog.attach(
+        "portfolio_stats",
+        lambda: PortfolioStats(load_metric_config(METRICS_CONFIG))
+    )
 
-    # Search filter
-    search_term = st.text_input("🔎 Search Projects", key="search_filter")
+    # Optionally build every chart and diagram in the background (PORTFOLIO_PREWARM=1)
+    start_prewarm(projects)
 
-    # Apply filters
-    filtered_projects = []
-    for project in projects:
-        # Tag filter
-        tag_match = True
-        if selected_tags:
-            tag_match = all(tag in project.get("tags", []) for tag in selected_tags)
-
-        # Search filter
-        search_match = True
-        if search_term:
-            search_text = (project.get("title", "") + " " + project.get("summary", "")).lower()
-            search_match = search_term.lower() in search_text
+    # Add sidebar navigation
+    add_sidebar_navigation(projects, index)
 
-        if tag_match and search_match:
-            filtered_projects.append(project)
+    # Filter functionality in sidebar
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### 🔍 Filters")
 
-    # Show filter results
-    if selected_tags or search_term:
-        st.markdown(f"**📊 Showing {len(filtered_projects)} of {len(projects)} projects**")
+        # Tag filter
+        selected_tags = st.multiselect("Filter by Technology", options=index.tags, key="tag_filter")
 
-# Main content area
-st.markdown('<div class="main">', unsafe_allow_html=True)
+        # Search filter
+        search_term = st.text_input("🔎 Search Projects", key="search_filter")
+
+        # Apply filters (tag AND-filter, then ranked search)
+        with timer("filter"):
+            filtered_projects = index.filter(selected_tags, search_term)
+
+        # Show filter results
+        if selected_tags or search_term:
+            st.markdown(f"**📊 Showing {len(filtered_projects)} of {len(projects)} projects**")
+
+        # Loader diagnostics, enabled with ?debug=1
+        if "debug" in st.query_params:
+            load_stats = catalog.last_load
+            st.markdown("---")
+            st.markdown("### 🧪 Debug")
+            st.caption(
+                f"Catalog v{load_stats['version']}: {load_stats['files']} files in "
+                f"{load_stats['seconds'] * 1000:.1f} ms "
+                f"({load_stats['hits']} cached, {load_stats['from_snapshot']} from snapshot, "
+                f"{load_stats['reparsed']} re-parsed)"
+            )
+            chart_stats = figure_cache.stats()
+            st.caption(
+                f"Figure cache: {chart_stats['entries']}/{chart_stats['maxsize']} entries, "
+                f"{chart_stats['hits']} hits, {chart_stats['misses']} misses, "
+                f"{chart_stats['evictions']} evictions"
+            )
+            data_stats = dataset_registry.stats()
+            st.caption(
+                f"Datasets: {data_stats['entries']} files, {data_stats['bytes'] / 2**20:.1f}/"
+                f"{data_stats['max_bytes'] / 2**20:.0f} MiB, {data_stats['hits']} hits, "
+                f"{data_stats['misses']} misses, {data_stats['evictions']} evictions"
+            )
+            if prewarm_status["state"] == "running":
+                st.caption(f"Prewarm: {prewarm_status['done']}/{prewarm_status['total']} figures")
+            elif prewarm_status["state"] == "done":
+                st.caption(
+                    f"Prewarm: {prewarm_status['total']} figures in {prewarm_status['seconds']:.1f}s "
+                    f"({len(prewarm_status['failed'])} failed)"
+                )
+            for _, message in catalog.errors.values():
+                st.caption(f"❌ {message}")
+            for problem in routes.problems:
+                st.caption(f"⚠️ {problem}")
+
+    # Main content area
+    st.markdown('<div class="main">', unsafe_allow_html=True)
+
+    # Route to appropriate page
+    if "project" in st.query_params:
+        # Project detail page
+        project_key = st.query_params["project"]
+        current_project, canonical_key = routes.resolve(project_key)
+
+        if current_project:
+            # Renamed projects: point the URL at the current key
+            if canonical_key != project_key:
+                st.query_params["project"] = canonical_key
+            render_project_page(current_project)
+        else:
+            st.error(f"🚫 Project not found: `{project_key}`")
+            st.info("The requested project does not exist or may have been moved.")
+
+            if st.button("🏠 Return to Portfolio Home"):
+                st.query_params.clear()
+                st.rerun()
+    else:
+        # Home page
+        if selected_tags or search_term:
+            render_home(filtered_projects, portfolio_stats.summary(filtered_projects))
+        else:
+            render_home(projects, portfolio_stats.summary())
 
-# Route to appropriate page
-if "project" in st.query_params:
-    # Project detail page
-    project_key = st.query_params["project"]
-    current_project = next((p for p in projects if p["key"] == project_key), None)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-    if current_project:
-        render_project_page(current_project)
-    else:
-        st.error("🚫 Project not found!")
-        st.info("The requested project does not exist or may have been moved.")
-
-        if st.button("🏠 Return to Portfolio Home"):
-            st.query_params.clear()
-            st.rerun()
-else:
-    # Home page
-    projects_to_show = filtered_projects if (selected_tags or search_term) else projects
-    render_home(projects_to_show)
-
-st.markdown('</div>', unsafe_allow_html=True)
-
-# Footer
-st.markdown("---")
-st.markdown("""
+    # Footer
+    st.markdown("---")
+    st.markdown("""
 <div style="text-align: center; color: #6b7280; padding: 20px 0;">
     <p>📊 <strong>Analytics Projects Portfolio</strong> | Built with Streamlit & Python | 
     <a href="#" style="color: #3b82f6; text-decoration: none;">Interactive Data Science Showcase</a></p>
 </div>
 """, unsafe_allow_html=True)
+
+finally:
+    # st.rerun() and st.stop() leave the page body early; the timers are
+    # closed and the profiler stopped either way
+    rerun = metrics.finish_rerun()
+    export_rerun(rerun)
+    profile = profile_report(profiler) if profiler else None
+
+# Show this rerun's timers with ?debug=1
+if profile and not profile_requested:
+    logger.info("Sampled profile (%s page):\n%s", rerun["page"], profile)
+
+if "debug" in st.query_params or profile_requested:
+    with st.sidebar:
+        if "debug" in st.query_params:
+            st.markdown("### ⏱️ Performance")
+            st.caption(f"This rerun: {rerun['seconds'] * 1000:.1f} ms")
+            for name, (calls, seconds) in sorted(rerun["timers"].items(), key=lambda item: -item[1][1]):
+                st.caption(f"{name}: {seconds * 1000:.1f} ms ({calls}×)")
+            for name, value in sorted(rerun["counters"].items()):
+                st.caption(f"{name}: {value}")
+
+            with st.expander("Process totals"):
+                timers, counters = metrics.totals()
+                rows = ["| Name | Calls | Total ms | Max ms |", "|---|---:|---:|---:|"]
+                rows += [
+                    f"| {name} | {calls} | {total * 1000:.1f} | {slowest * 1000:.1f} |"
+                    for name, (calls, total, slowest) in sorted(timers.items())
+                ]
+                st.markdown("\n".join(rows))
+                for name, value in sorted(counters.items()):
+                    st.caption(f"{name}: {value}")
+
+        if profile_requested:
+            if profile:
+                with st.expander("🔬 Profile (top functions by cumulative time)", expanded=True):
+                    st.code(profile)
+            else:
+                st.caption("🔬 Another request is being profiled; reload to try again.")
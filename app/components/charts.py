@@ -1,9 +1,158 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import logging, os
 from pathlib import Path
+from components.figure_cache import figure_cache, spec_key
+from components.figure_payload import figure_json
+from components.datasets import resolve_data_path, spec_columns
+from components.dataset_registry import dataset_registry
+from components.transforms import transformed_frame
+from components.reduction import reduce_frame, reduce_histogram, hover_columns
+from components.downloads import csv_export_bytes, render_lazy_download
+from components.instrumentation import metrics, timed
 
+logger = logging.getLogger(__name__)
+
+RAW_DATA_ROWS = 1000
+
+# Scatter and line charts with more points than this are drawn with WebGL
+WEBGL_ENV = "PORTFOLIO_WEBGL_POINTS"
+WEBGL_POINTS = 1000
+
+def webgl_threshold():
+    """The point count set by PORTFOLIO_WEBGL_POINTS, or WEBGL_POINTS if unset or invalid"""
+
+    value = os.environ.get(WEBGL_ENV)
+    if not value:
+        return WEBGL_POINTS
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Ignoring %s=%r (not an integer); using %d", WEBGL_ENV, value, WEBGL_POINTS)
+        return WEBGL_POINTS
+
+webgl_points = webgl_threshold()
+
+def render_mode(spec, df):
+    """"webgl" or "svg" for a scatter/line chart; `render_mode` in the spec forces one"""
+
+    forced = spec.get("render_mode", "auto")
+    if forced in ("webgl", "svg"):
+        return forced
+    return "webgl" if len(df) > webgl_points else "svg"
+
+def build_chart(spec, df):
+    """Build the Plotly figure for a visual spec from its data"""
+
+    # Bound the rows sent to the browser before plotting
+    df = reduce_frame(spec, df)
+    hover_data = hover_columns(spec, df)
+    labels = spec.get("labels")
+
+    # Standard chart types
+    if spec["type"] == "bar":
+        fig = px.bar(
+            df,
+            x=spec["x"],
+            y=spec["y"],
+            color=spec.get("color"),
+            barmode=spec.get("barmode", "relative"),
+            title=spec.get("title",""),
+            labels=labels,
+            hover_data=hover_data
+        )
+    elif spec["type"] == "line":
+        fig = px.line(
+            df,
+            x=spec["x"],
+            y=spec["y"],
+            color=spec.get("color"),
+            title=spec.get("title",""),
+            labels=labels,
+            markers=True,
+            render_mode=render_mode(spec, df),
+            hover_data=hover_data
+        )
+    elif spec["type"] == "scatter":
+        fig = px.scatter(
+            df,
+            x=spec["x"],
+            y=spec["y"],
+            color=spec.get("color"),
+            size=spec.get("size"),
+            title=spec.get("title",""),
+            labels=labels,
+            render_mode=render_mode(spec, df),
+            hover_data=hover_data
+        )
+    elif spec["type"] == "pie":
+        fig = px.pie(
+            df,
+            values=spec["y"],
+            names=spec.get("color",spec["x"]),
+            title=spec.get("title",""),
+            labels=labels
+        )
+    elif spec["type"] == "histogram" and (binned := reduce_histogram(df, spec)) is not None:
+        fig = px.bar(
+            binned,
+            x=spec["x"],
+            y="count",
+            color=spec.get("color"),
+            title=spec.get("title",""),
+            labels=labels
+        )
+        fig.update_layout(bargap=0)
+    elif spec["type"] == "histogram":
+        fig = px.histogram(
+            df,
+            x=spec["x"],
+            color=spec.get("color"),
+            title=spec.get("title",""),
+            labels=labels
+        )
+    else:
+        fig = px.bar(
+            df,
+            x=spec["x"],
+            y=spec["y"],
+            color=spec.get("color")
+        )
+
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        hovermode='x unified',
+        font=dict(size=12),
+        title_font_size=16,
+        xaxis_title_font_size=14,
+        yaxis_title_font_size=14
+    )
+
+    return fig
+
+def chart_frame(spec, source):
+    """The frame a visual plots: its columns of the shared dataset, after any transforms"""
+    return transformed_frame(spec, source, lambda: dataset_registry.get(source, spec_columns(spec)))
+
+def chart_entry(spec):
+    """(cache key, {"figure": json}) for a visual, built on first use"""
+
+    # Read the columnar copy when available, and only the referenced columns
+    source = resolve_data_path(spec["data_path"])
+
+    # Figures are cached by spec and data file content, across sessions
+    def build():
+        metrics.count("chart_builds")
+        fig = build_chart(spec, chart_frame(spec, source))
+        return {"figure": figure_json(fig, spec.get("title", str(source)))}
+
+    cache_key = spec_key(spec, source)
+    return cache_key, figure_cache.get_or_build(cache_key, build)
+
+@timed("render_chart")
 def render_chart(spec):
     """Render interactive charts using Plotly with error handling"""
 
@@ -14,116 +163,28 @@ def render_chart(spec):
         return
 
     try:
-        df = pd.read_csv(spec["data_path"])
         st.markdown(f"### 📊 {spec.get('title','Chart')}")
         if spec.get("description"):
             st.caption(spec["description"])
 
-        # Special case: trend classification counts
-        if "trend_classification.csv" in spec["data_path"]:
-            # Melt and count patterns
-            dfm = df.melt(
-                id_vars=["month"],
-                value_vars=["visit_trend","revenue_trend","item_trend"],
-                var_name="metric",
-                value_name="trend_pattern"
-            )
-            dfc = dfm["trend_pattern"].value_counts().reset_index()
-            dfc.columns = ["trend_pattern","count"]
-            fig = px.bar(
-                dfc,
-                x="trend_pattern",
-                y="count",
-                color="trend_pattern",
-                title=spec.get("title",""),
-                labels={"count":"Count","trend_pattern":"Pattern"}
-            )
-
-        # Special case: GMS revenue by platform and tier
-        elif "cluster_revenue_platform.csv" in spec["data_path"]:
-            fig = px.bar(
-                df,
-                x=spec["x"],
-                y=spec["y"],
-                color=spec.get("color"),
-                barmode="group",
-                title=spec.get("title",""),
-                hover_data=["sku_count","avg_price_bucket"]
-            )
-
-        else:
-            # Standard chart types
-            if spec["type"] == "bar":
-                fig = px.bar(
-                    df,
-                    x=spec["x"],
-                    y=spec["y"],
-                    color=spec.get("color"),
-                    title=spec.get("title",""),
-                    hover_data=df.columns.tolist()
-                )
-            elif spec["type"] == "line":
-                fig = px.line(
-                    df,
-                    x=spec["x"],
-                    y=spec["y"],
-                    color=spec.get("color"),
-                    title=spec.get("title",""),
-                    markers=True,
-                    hover_data=df.columns.tolist()
-                )
-            elif spec["type"] == "scatter":
-                fig = px.scatter(
-                    df,
-                    x=spec["x"],
-                    y=spec["y"],
-                    color=spec.get("color"),
-                    size=spec.get("size"),
-                    title=spec.get("title",""),
-                    hover_data=df.columns.tolist()
-                )
-            elif spec["type"] == "pie":
-                fig = px.pie(
-                    df,
-                    values=spec["y"],
-                    names=spec.get("color",spec["x"]),
-                    title=spec.get("title","")
-                )
-            elif spec["type"] == "histogram":
-                fig = px.histogram(
-                    df,
-                    x=spec["x"],
-                    color=spec.get("color"),
-                    title=spec.get("title","")
-                )
-            else:
-                fig = px.bar(
-                    df,
-                    x=spec["x"],
-                    y=spec["y"],
-                    color=spec.get("color")
-                )
-
-        fig.update_layout(
-            height=500,
-            showlegend=True,
-            hovermode='x unified',
-            font=dict(size=12),
-            title_font_size=16,
-            xaxis_title_font_size=14,
-            yaxis_title_font_size=14
-        )
+        cache_key, entry = chart_entry(spec)
+        fig = pio.from_json(entry["figure"])
+        df = chart_frame(spec, resolve_data_path(spec["data_path"]))
 
         st.plotly_chart(fig, use_container_width=True)
 
         with st.expander("📋 View Raw Data"):
-            st.dataframe(df, use_container_width=True)
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="⬇️ Download Data as CSV",
-                data=csv,
-                file_name=f"{spec.get('title','chart_data').lower().replace(' ','_')}.csv",
-                mime='text/csv'
+            # Only a preview is sent to the browser; the CSV has every row
+            st.dataframe(df.head(RAW_DATA_ROWS), use_container_width=True)
+            if len(df) > RAW_DATA_ROWS:
+                st.caption(f"Showing the first {RAW_DATA_ROWS:,} of {len(df):,} rows.")
+            # The CSV export is generated on request and cached by content
+            render_lazy_download(
+                "⬇️ Download Data as CSV",
+                cache_key,
+                lambda: csv_export_bytes(df, cache_key),
+                f"{spec.get('title','chart_data').lower().replace(' ','_')}.csv",
+                'text/csv'
             )
 
     except Exception as e:
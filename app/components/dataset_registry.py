@@ -0,0 +1,140 @@
+"""Shared, memory-bounded cache of the datasets behind visuals.
+
+Each data file is read once per content version, with the union of the
+columns its visuals use, and every visual gets its columns from that one
+frame. Before rendering its charts a project page calls `prepare()` with
+all of its visuals, which reads every distinct file concurrently in a
+thread pool, so page latency is the slowest read rather than their sum.
+
+Frames derived from a file, such as the output of a visual's transform
+chain, are kept in the same registry via `derived()`. All frames are
+evicted least-recently-used first once their combined in-memory size
+exceeds the budget, and are dropped when their file changes.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from components.datasets import read_dataset, resolve_data_path, spec_columns
+from components.figure_cache import file_fingerprint
+from components.instrumentation import metrics
+
+DATASET_CACHE_BYTES = 256 << 20
+DATASET_WORKERS = 8
+
+# Parsing is mostly I/O and pandas C code, which release the GIL
+_pool = ThreadPoolExecutor(max_workers=DATASET_WORKERS, thread_name_prefix="dataset-load")
+
+def merge_columns(a, b):
+    """Union of two column lists, where None means every column"""
+    if a is None or b is None:
+        return None
+    return list(dict.fromkeys(list(a) + list(b)))
+
+def covers(loaded, wanted):
+    return loaded is None or (wanted is not None and set(wanted) <= set(loaded))
+
+class DatasetRegistry:
+    """LRU of parsed data files, bounded by their total memory use"""
+
+    def __init__(self, max_bytes=DATASET_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (path, fingerprint[, derived name]) -> (columns, frame, bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source, columns=None):
+        """`columns` of a data file (all when None), read only if no loaded frame has them"""
+
+        key = (str(source), file_fingerprint(source))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and covers(entry[0], columns):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frame = entry[1]
+            else:
+                self.misses += 1
+                frame = None
+                # Widen an existing frame rather than keeping two copies
+                wanted = merge_columns(entry[0], columns) if entry else columns
+
+        if frame is None:
+            metrics.count("dataset_reads")
+            frame = read_dataset(source, columns=wanted)
+            self._store(key, wanted, frame)
+
+        return frame if columns is None else frame[list(columns)]
+
+    def derived(self, source, name, build):
+        """The frame `build()` computes from a data file, cached as `name` per file version"""
+
+        key = (str(source), file_fingerprint(source), name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        frame = build()
+        self._store(key, None, frame)
+        return frame
+
+    def _store(self, key, columns, frame):
+        nbytes = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            # Older versions of the same file, and frames derived from them,
+            # are no longer reachable
+            for stale in [k for k in self._entries if k[0] == key[0] and k[1] != key[1]]:
+                self._drop(stale)
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = (columns, frame, nbytes)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.size -= self._entries.pop(key)[2]
+
+    def prepare(self, specs):
+        """Start loading every data file used by `specs`, once each with the columns
+        they need together; returns a future per spec (None when its file is missing)"""
+
+        needed = {}
+        sources = []
+        for spec in specs:
+            if not Path(spec["data_path"]).exists():
+                sources.append(None)
+                continue
+            source = resolve_data_path(spec["data_path"])
+            columns = spec_columns(spec)
+            needed[source] = merge_columns(needed[source], columns) if source in needed else columns
+            sources.append(source)
+
+        futures = {source: _pool.submit(self.get, source, columns) for source, columns in needed.items()}
+        return [futures.get(source) for source in sources]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+dataset_registry = DatasetRegistry()
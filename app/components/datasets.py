@@ -0,0 +1,92 @@
+"""Reading visual datasets from CSV or columnar (Parquet/Arrow) files.
+
+Convert the CSV exports once so charts can read only the columns they use:
+
+    cd app
+    python -m components.datasets data/visuals
+
+A `.parquet` file written next to a CSV is picked up automatically as long
+as it is at least as new as the CSV, so project YAML can keep pointing at
+the `.csv` path.
+"""
+
+import sys
+import pandas as pd
+from pathlib import Path
+
+COLUMNAR_SUFFIXES = {".parquet", ".feather", ".arrow"}
+
+# Spec keys that name a column of the dataset
+COLUMN_KEYS = ("x", "y", "color", "size")
+
+# String columns with fewer distinct values than this share are stored as categories
+CATEGORY_RATIO = 0.5
+
+def spec_columns(spec):
+    """Columns a visual reads, or None when it needs the whole file"""
+
+    if spec.get("columns"):
+        return list(dict.fromkeys(spec["columns"]))
+    if spec.get("transform"):
+        # Plotted columns name the transform's output, not the file's
+        return None
+
+    columns = [spec[key] for key in COLUMN_KEYS if spec.get(key)]
+    columns += spec.get("hover_data") or []
+    return list(dict.fromkeys(columns)) or None
+
+def resolve_data_path(path):
+    """Prefer a converted columnar copy of a CSV when it is up to date"""
+
+    path = Path(path)
+    if path.suffix.lower() != ".csv":
+        return path
+
+    columnar = path.with_suffix(".parquet")
+    if columnar.exists() and columnar.stat().st_mtime >= path.stat().st_mtime:
+        return columnar
+    return path
+
+def read_dataset(path, columns=None):
+    """Read a dataset, loading only `columns` when given"""
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    if suffix in (".feather", ".arrow"):
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+def optimize_dtypes(df):
+    """Downcast numbers and turn repetitive strings into categoricals"""
+
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast="integer")
+        elif series.dtype == object and len(series):
+            if series.nunique(dropna=False) / len(series) < CATEGORY_RATIO:
+                df[column] = series.astype("category")
+            else:
+                df[column] = series.astype("string")
+    return df
+
+def convert_csv_tree(root):
+    """Write a typed `.parquet` file next to every CSV under `root`"""
+
+    converted = []
+    for csv_path in sorted(Path(root).rglob("*.csv")):
+        df = optimize_dtypes(pd.read_csv(csv_path))
+        out = csv_path.with_suffix(".parquet")
+        df.to_parquet(out, index=False)
+        converted.append((csv_path, out, len(df)))
+    return converted
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m components.datasets VISUALS_DIR")
+    for csv_path, out, rows in convert_csv_tree(sys.argv[1]):
+        print(f"{csv_path} -> {out.name} ({rows} rows)")
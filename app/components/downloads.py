@@ -0,0 +1,89 @@
+import streamlit as st
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from components.figure_cache import file_fingerprint
+
+DOWNLOAD_CACHE_BYTES = 64 << 20
+
+# Files under app/static are served by Streamlit itself (streamed in chunks)
+# when server.enableStaticServing is on, so they never pass through Python
+STATIC_DIR = Path("static")
+
+class ByteCache:
+    """LRU cache of download payloads, bounded by total size in bytes"""
+
+    def __init__(self, max_bytes=DOWNLOAD_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        data = build()
+
+        with self._lock:
+            if key not in self._entries and len(data) <= self.max_bytes:
+                self._entries[key] = data
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
+
+download_cache = ByteCache()
+
+def read_file_bytes(path):
+    """Whole file content, read on first request and then cached by content fingerprint"""
+    return download_cache.get_or_build(("file",) + file_fingerprint(path), Path(path).read_bytes)
+
+def csv_export_bytes(df, key):
+    """CSV export of a frame, generated once per content key"""
+    return download_cache.get_or_build(("csv", key), lambda: df.to_csv(index=False).encode("utf-8"))
+
+def static_url(path):
+    """URL for a file Streamlit can serve statically, else None"""
+
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    try:
+        relative = Path(path).resolve().relative_to(STATIC_DIR.resolve())
+    except ValueError:
+        return None
+    return f"app/static/{relative.as_posix()}"
+
+def render_lazy_download(label, key, load, file_name, mime):
+    """Download button whose bytes are only produced once the user asks.
+
+    The save button is shown for one rerun only, so later reruns of the
+    page do not send the bytes to the browser again.
+    """
+
+    if not st.button(label, key=f"prepare_{key}"):
+        return
+
+    st.download_button(
+        f"💾 Save {file_name}",
+        data=load(),
+        file_name=file_name,
+        mime=mime,
+        key=f"download_{key}"
+    )
+
+def render_file_download(label, path, key):
+    """Download for a resource file, streamed statically when possible"""
+
+    path = Path(path)
+    mime = "text/csv" if path.suffix == ".csv" else "application/octet-stream"
+
+    url = static_url(path)
+    if url:
+        st.markdown(f'<a href="{url}" download="{path.name}">{label}</a>', unsafe_allow_html=True)
+        return
+
+    render_lazy_download(label, key, lambda: read_file_bytes(path), path.name, mime)
@@ -0,0 +1,90 @@
+import hashlib, json, os, threading
+from collections import OrderedDict
+
+FIGURE_CACHE_SIZE = 128
+
+class FigureCache:
+    """Thread-safe LRU cache shared by every session in the process"""
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key, build):
+        entry = self.get(key)
+        if entry is None:
+            entry = build()
+            self.put(key, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+figure_cache = FigureCache()
+
+_digests = {}
+_digests_lock = threading.Lock()
+
+def file_fingerprint(path):
+    """(mtime, size, sha1) of a file; the hash is only recomputed when mtime or size change"""
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _digests_lock:
+        cached = _digests.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    fingerprint = signature + (digest.hexdigest(),)
+
+    with _digests_lock:
+        _digests[path] = (signature, fingerprint)
+    return fingerprint
+
+def spec_key(spec, *paths):
+    """Cache key for a visual spec plus the current content of its data files"""
+    payload = json.dumps(
+        {"spec": spec, "files": [file_fingerprint(p) for p in paths]},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
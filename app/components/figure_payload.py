@@ -0,0 +1,157 @@
+"""Shrinking figure JSON before it is sent to the browser.
+
+Figures are compacted once, when they are built and cached:
+
+- numeric arrays become Plotly typed arrays (`{"dtype", "bdata"}`, base64),
+  which plotly.js >= 2.28 decodes natively;
+- integer arrays use the narrowest integer dtype that holds them, and wider
+  integers (epoch milliseconds, say) stay exact as float64;
+- floats are rounded to FLOAT_DIGITS significant digits of each value or of
+  the array's range, whichever is finer, and coordinate arrays that plotly
+  formats through an axis are stored as float32 when that keeps them within
+  the same precision;
+- trace properties equal to the plotly.js defaults are dropped.
+
+Set PORTFOLIO_COMPACT_FIGURES=0 to send plain JSON instead. Figures larger
+than REPORT_BYTES are logged with their size before and after, measured as
+Streamlit serializes them for the browser.
+"""
+
+import base64, json, logging, math, os
+import numpy as np
+import plotly.io as pio
+from components.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+COMPACT_ENV = "PORTFOLIO_COMPACT_FIGURES"
+FLOAT_DIGITS = 6
+REPORT_BYTES = 100 << 10
+
+# Shorter arrays cost less as JSON than as base64
+MIN_ARRAY_LENGTH = 8
+
+# Arrays shown through axis formatting, where float32 loses nothing visible
+AXIS_ARRAYS = {"x", "y", "z"}
+
+TRACE_DEFAULTS = {
+    "xaxis": "x",
+    "yaxis": "y",
+    "visible": True,
+    "opacity": 1,
+    "showlegend": True,
+}
+
+INT_DTYPES = (("i1", np.int8), ("u1", np.uint8), ("i2", np.int16), ("u2", np.uint16), ("i4", np.int32), ("u4", np.uint32))
+
+def compact_enabled():
+    return os.environ.get(COMPACT_ENV, "1") != "0"
+
+def encode_typed_array(values, dtype):
+    return {"dtype": dtype, "bdata": base64.b64encode(values.astype(np.dtype(dtype)).tobytes()).decode("ascii")}
+
+def typed_array(values, axis=False):
+    """Plotly typed-array spec for a numeric array, in the smallest dtype that keeps it"""
+
+    finite = np.isfinite(values).all()
+    if np.issubdtype(values.dtype, np.integer) or (finite and np.array_equal(values, np.round(values))):
+        if len(values):
+            low, high = values.min(), values.max()
+            for code, dtype in INT_DTYPES:
+                info = np.iinfo(dtype)
+                if info.min <= low and high <= info.max:
+                    return encode_typed_array(values, code)
+        # Beyond 32 bits, float64 holds integers exactly up to 2**53
+        return encode_typed_array(values, "f8")
+
+    values = round_significant(values.astype(np.float64))
+    return encode_typed_array(values, "f4" if axis and fits_float32(values) else "f8")
+
+def round_significant(values, digits=FLOAT_DIGITS):
+    """Round each value to `digits` significant digits of itself or of the
+    array's range, whichever is finer, so neither small values nor small
+    steps between large values are lost"""
+
+    finite = np.isfinite(values)
+    if not finite.any():
+        return values
+    kept = values[finite]
+    magnitude = np.floor(np.log10(np.abs(kept), out=np.full(kept.shape, -np.inf), where=kept != 0))
+    spread = kept.max() - kept.min()
+    if spread:
+        magnitude = np.minimum(magnitude, math.floor(math.log10(spread)))
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        scale = 10.0 ** (digits - 1 - np.maximum(magnitude, -300))
+        rounded = np.round(kept * scale) / scale
+    rounded = np.where(np.isfinite(rounded), rounded, kept)
+
+    values = values.copy()
+    values[finite] = rounded
+    return values
+
+def fits_float32(values, digits=FLOAT_DIGITS):
+    """Whether float32 keeps every value within 10**-digits of itself and of the array's range"""
+
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return True
+    with np.errstate(over="ignore"):
+        error = np.abs(finite.astype(np.float32).astype(np.float64) - finite)
+    tolerance = 10.0 ** -digits * np.minimum(np.abs(finite), finite.max() - finite.min())
+    return bool((error <= tolerance).all())
+
+def decode_typed_array(spec):
+    return np.frombuffer(base64.b64decode(spec["bdata"]), dtype=np.dtype(spec["dtype"]))
+
+def numeric_array(value, axis):
+    """Array for a JSON value that should be encoded, else None"""
+
+    if isinstance(value, dict) and "bdata" in value and "dtype" in value and "shape" not in value:
+        return decode_typed_array(value)
+    if not isinstance(value, list) or len(value) < MIN_ARRAY_LENGTH:
+        return None
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) or (v is None and axis) for v in value):
+        return None
+    # None marks a gap in a line; NaN does the same in a typed array
+    return np.array([np.nan if v is None else v for v in value], dtype=np.float64)
+
+def compact_value(value, name=""):
+    if isinstance(value, dict) and "bdata" not in value:
+        return {key: compact_value(item, key) for key, item in value.items()}
+
+    array = numeric_array(value, name in AXIS_ARRAYS)
+    if array is None:
+        return value
+    return typed_array(array, axis=name in AXIS_ARRAYS)
+
+def compact_trace(trace):
+    trace = {key: value for key, value in trace.items() if TRACE_DEFAULTS.get(key, ...) != value}
+    return {key: compact_value(value, key) for key, value in trace.items()}
+
+def sent_bytes(figure_json):
+    """Size of what Streamlit sends for the figure in `figure_json`.
+
+    Callers pass pio.from_json(figure_json) to st.plotly_chart, which
+    serializes it again with pio.to_json; that escapes every "/" in the
+    base64 buffers, so the browser receives more than the cached string.
+    """
+    return len(pio.to_json(pio.from_json(figure_json), validate=False))
+
+def figure_json(fig, label="figure"):
+    """The JSON cached for a figure, compacted unless disabled"""
+
+    raw = pio.to_json(fig, validate=False)
+    if not compact_enabled():
+        return raw
+
+    figure = json.loads(raw)
+    figure["data"] = [compact_trace(trace) for trace in figure.get("data", [])]
+    compact = json.dumps(figure, separators=(",", ":"))
+
+    before, after = len(raw), sent_bytes(compact)
+    metrics.count("figure_bytes_raw", before)
+    metrics.count("figure_bytes_sent", after)
+    if before > REPORT_BYTES:
+        logger.info("Figure payload %s: %d -> %d bytes (%.0f%%)", label, before, after, 100 * after / before)
+    return compact
@@ -0,0 +1,201 @@
+"""Layered (Sugiyama-style) layout for pipeline diagrams.
+
+The steps are the classic ones:
+
+1. break cycles by reversing DFS back edges
+2. assign layers by longest path from the sources
+3. split edges spanning several layers with dummy nodes
+4. order each layer with barycenter sweeps to reduce crossings
+5. place nodes near the average of their upstream neighbours, keeping a
+   minimum spacing inside each layer
+
+Each step is linear in the nodes plus edges it sees (the sweeps add a sort
+per layer), but step 3 adds a node per layer an edge crosses, and longest-
+path layering makes chain-shaped graphs very deep. Only edges spanning at
+most MAX_EDGE_SPAN layers are split, so there are at most
+(MAX_EDGE_SPAN - 1) dummies per edge; longer edges take no part in ordering
+and are drawn as a single curve. Split edges are drawn through their dummy
+positions, returned as the layout's `routes`.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+HORIZONTAL_SPACING = 3.0
+VERTICAL_SPACING = 3.0
+ORDERING_SWEEPS = 4
+
+# Longest layer span that is routed through dummy nodes
+MAX_EDGE_SPAN = 8
+
+class FlowLayout(NamedTuple):
+    positions: dict  # node -> {'x', 'y', 'level'}
+    routes: dict     # (source, target) -> [(x, y), ...] bend points of split edges
+
+def acyclic_edges(nodes, edges):
+    """Edges with every DFS back edge reversed, so the graph is a DAG"""
+
+    successors = {node: [] for node in nodes}
+    for source, target in edges:
+        successors[source].append(target)
+
+    state = dict.fromkeys(nodes, 0)  # 0 new, 1 on stack, 2 done
+    reversed_edges = set()
+
+    for root in nodes:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state[child] == 1:
+                    reversed_edges.add((node, child))
+                elif not state[child]:
+                    state[child] = 1
+                    stack.append((child, iter(successors[child])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+
+    return [(t, s) if (s, t) in reversed_edges else (s, t) for s, t in edges]
+
+def assign_layers(nodes, edges):
+    """Longest-path layering: every edge points to a strictly lower layer"""
+
+    successors = {node: [] for node in nodes}
+    indegree = dict.fromkeys(nodes, 0)
+    for source, target in edges:
+        successors[source].append(target)
+        indegree[target] += 1
+
+    layer = dict.fromkeys(nodes, 0)
+    queue = [node for node in nodes if not indegree[node]]
+    for node in queue:
+        for child in successors[node]:
+            layer[child] = max(layer[child], layer[node] + 1)
+            indegree[child] -= 1
+            if not indegree[child]:
+                queue.append(child)
+    return layer
+
+def split_long_edges(layer, edges):
+    """Insert dummy nodes so every edge joins adjacent layers.
+
+    Returns the short edges and, by index into `edges`, the dummy chain of
+    each split edge. Edges spanning more than MAX_EDGE_SPAN layers are left
+    out entirely.
+    """
+
+    short_edges = []
+    chains = {}
+    for index, (source, target) in enumerate(edges):
+        if layer[target] - layer[source] > MAX_EDGE_SPAN:
+            continue
+        previous = source
+        for step in range(layer[source] + 1, layer[target]):
+            dummy = ("dummy", index, step)
+            layer[dummy] = step
+            chains.setdefault(index, []).append(dummy)
+            short_edges.append((previous, dummy))
+            previous = dummy
+        short_edges.append((previous, target))
+    return short_edges, chains
+
+def order_layers(nodes, layer, edges):
+    """Barycenter sweeps down and up the layers to reduce edge crossings"""
+
+    depth = max(layer.values()) + 1 if layer else 0
+    layers = [[] for _ in range(depth)]
+    for node in nodes:
+        layers[layer[node]].append(node)
+    for node in layer:
+        if isinstance(node, tuple):
+            layers[layer[node]].append(node)
+
+    upper = {node: [] for node in layer}
+    lower = {node: [] for node in layer}
+    for source, target in edges:
+        lower[source].append(target)
+        upper[target].append(source)
+
+    for sweep in range(ORDERING_SWEEPS):
+        downward = sweep % 2 == 0
+        span = range(1, depth) if downward else range(depth - 2, -1, -1)
+        neighbours = upper if downward else lower
+        for index in span:
+            reference = layers[index - 1] if downward else layers[index + 1]
+            position = {node: i for i, node in enumerate(reference)}
+
+            def barycenter(item):
+                i, node = item
+                linked = [position[n] for n in neighbours[node]]
+                return (sum(linked) / len(linked) if linked else i, i)
+
+            layers[index] = [node for _, node in sorted(enumerate(layers[index]), key=barycenter)]
+
+    return layers
+
+def assign_coordinates(layers, edges):
+    """x near the mean of upstream neighbours, with a minimum gap per layer"""
+
+    upper = {}
+    for source, target in edges:
+        upper.setdefault(target, []).append(source)
+
+    x = {}
+    for row in layers:
+        desired = []
+        for i, node in enumerate(row):
+            linked = [x[n] for n in upper.get(node, ()) if n in x]
+            desired.append(sum(linked) / len(linked) if linked else (i - (len(row) - 1) / 2) * HORIZONTAL_SPACING)
+
+        # Keep the order, push nodes apart, then re-center on the desired mean
+        placed = []
+        for want in desired:
+            placed.append(max(want, placed[-1] + HORIZONTAL_SPACING) if placed else want)
+        shift = (sum(desired) - sum(placed)) / len(placed) if placed else 0
+        for node, value in zip(row, placed):
+            x[node] = value + shift
+
+    return x
+
+@lru_cache(maxsize=256)
+def layered_layout(nodes, edges):
+    """FlowLayout for a diagram given as tuples of node names and (source, target) pairs.
+
+    Results are cached per diagram; treat the returned dicts as read-only.
+    """
+
+    nodes = tuple(dict.fromkeys(nodes))
+    known = set(nodes)
+    given = [
+        (source, target) for source, target in dict.fromkeys(edges)
+        if source in known and target in known and source != target
+    ]
+
+    edges = acyclic_edges(nodes, given)
+    layer = assign_layers(nodes, edges)
+    short_edges, chains = split_long_edges(layer, edges)
+    layers = order_layers(nodes, layer, short_edges)
+    x = assign_coordinates(layers, short_edges)
+
+    depth = len(layers)
+
+    def point(node):
+        return x[node], (depth - layer[node] - 1) * VERTICAL_SPACING
+
+    positions = {
+        node: {'x': x[node], 'y': point(node)[1], 'level': layer[node]}
+        for node in nodes
+    }
+
+    # Bend points run from the edge's own source, also for reversed edges
+    routes = {}
+    for index, chain in chains.items():
+        bends = [point(dummy) for dummy in chain]
+        routes[given[index]] = bends if edges[index] == given[index] else bends[::-1]
+
+    return FlowLayout(positions, routes)
@@ -0,0 +1,200 @@
+"""Timers and counters for each rerun, with optional export and profiling.
+
+Hot paths are wrapped with `timed(name)` (or `with timer(name):`); each call
+is added to the process-wide totals and, on the script thread, to the
+current rerun. The ?debug=1 sidebar shows both.
+
+Export is enabled with PORTFOLIO_METRICS_FILE: a path ending in `.prom`
+is rewritten with the totals in Prometheus text format after every rerun,
+any other path gets one JSON line per rerun.
+
+?profile=1 runs a single rerun under cProfile and shows the top functions
+in the sidebar. PORTFOLIO_PROFILE_SAMPLE=0.01 profiles that fraction of
+reruns and logs the report instead.
+"""
+
+import cProfile, io, json, logging, os, pstats, random, threading, time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE_ENV = "PORTFOLIO_METRICS_FILE"
+PROFILE_SAMPLE_ENV = "PORTFOLIO_PROFILE_SAMPLE"
+PROFILE_TOP = 25
+
+class Metrics:
+    """Call counts and timings for the process, plus those of the current rerun"""
+
+    def __init__(self):
+        self.timers = {}    # name -> [calls, seconds, max seconds]
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_rerun(self, page="home"):
+        self._local.rerun = {"page": page, "started": time.perf_counter(), "timers": {}, "counters": {}}
+
+    def current(self):
+        return getattr(self._local, "rerun", None)
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self.timers.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+        rerun = self.current()
+        if rerun is not None:
+            calls, total = rerun["timers"].get(name, (0, 0.0))
+            rerun["timers"][name] = (calls + 1, total + seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+        rerun = self.current()
+        if rerun is not None:
+            rerun["counters"][name] = rerun["counters"].get(name, 0) + n
+
+    def finish_rerun(self):
+        """Close the current rerun, returning its record (or None)"""
+
+        rerun = self.current()
+        if rerun is None:
+            return None
+        self._local.rerun = None
+
+        seconds = time.perf_counter() - rerun.pop("started")
+        self.record("rerun", seconds)
+        rerun["seconds"] = seconds
+        return rerun
+
+    def totals(self):
+        with self._lock:
+            return {name: tuple(entry) for name, entry in self.timers.items()}, dict(self.counters)
+
+    def prometheus_text(self):
+        timers, counters = self.totals()
+        lines = [
+            "# HELP portfolio_calls_total Calls per instrumented function",
+            "# TYPE portfolio_calls_total counter",
+        ]
+        lines += [f'portfolio_calls_total{{name="{name}"}} {calls}' for name, (calls, _, _) in sorted(timers.items())]
+        lines += [
+            "# HELP portfolio_seconds_total Time spent per instrumented function",
+            "# TYPE portfolio_seconds_total counter",
+        ]
+        lines += [f'portfolio_seconds_total{{name="{name}"}} {total:.6f}' for name, (_, total, _) in sorted(timers.items())]
+        lines += [
+            "# HELP portfolio_seconds_max Slowest single call per instrumented function",
+            "# TYPE portfolio_seconds_max gauge",
+        ]
+        lines += [f'portfolio_seconds_max{{name="{name}"}} {slowest:.6f}' for name, (_, _, slowest) in sorted(timers.items())]
+        lines += [
+            "# HELP portfolio_events_total Instrumentation counters",
+            "# TYPE portfolio_events_total counter",
+        ]
+        lines += [f'portfolio_events_total{{name="{name}"}} {value}' for name, value in sorted(counters.items())]
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+_export_lock = threading.Lock()
+
+def timed(name):
+    """Decorator adding each call's duration to the metrics under `name`"""
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, time.perf_counter() - start)
+
+def export_rerun(rerun, path=None):
+    """Write a finished rerun (JSON lines) or the totals (.prom) to the metrics file"""
+
+    path = path or os.environ.get(METRICS_FILE_ENV)
+    if not path or rerun is None:
+        return
+
+    try:
+        with _export_lock:
+            if path.endswith(".prom"):
+                tmp = f"{path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    fh.write(metrics.prometheus_text())
+                os.replace(tmp, path)
+            else:
+                record = {
+                    "time": time.time(),
+                    "page": rerun["page"],
+                    "seconds": round(rerun["seconds"], 6),
+                    "timers": {name: {"calls": c, "seconds": round(s, 6)} for name, (c, s) in rerun["timers"].items()},
+                    "counters": rerun["counters"],
+                }
+                with open(path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logger.warning("Could not write metrics to %s: %s", path, e)
+
+# Only one profiler can be active per process. app.py stops it in a finally
+# block, so it is released even when st.rerun() cuts a rerun short; a
+# profile older than PROFILE_TIMEOUT seconds is only left behind by a thread
+# that died without unwinding, and is treated as abandoned.
+PROFILE_TIMEOUT = 60
+_profile_lock = threading.Lock()
+_active_profile = {}
+
+def profile_sampled():
+    """True for the sampled fraction of reruns set by PORTFOLIO_PROFILE_SAMPLE"""
+
+    try:
+        rate = float(os.environ.get(PROFILE_SAMPLE_ENV) or 0)
+    except ValueError:
+        return False
+    return rate > 0 and random.random() < rate
+
+def start_profile():
+    """An enabled profiler, or None if another rerun is being profiled"""
+
+    with _profile_lock:
+        active = _active_profile.get("profiler")
+        if active is not None:
+            if time.monotonic() - _active_profile["started"] < PROFILE_TIMEOUT:
+                return None
+            active.disable()
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool is already active
+            _active_profile.clear()
+            return None
+        _active_profile.update(profiler=profiler, started=time.monotonic())
+        return profiler
+
+def profile_report(profiler, limit=PROFILE_TOP):
+    """Stop the profiler and return the top functions by cumulative time"""
+
+    profiler.disable()
+    with _profile_lock:
+        if _active_profile.get("profiler") is profiler:
+            _active_profile.clear()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
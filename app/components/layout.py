@@ -1,11 +1,53 @@
 import streamlit as st
 from components.charts import render_chart
+from components.dataset_registry import dataset_registry
 from components.pipeline_diagram import render_flow
+from components.downloads import render_file_download
+from components.instrumentation import timed
+from loaders.portfolio_stats import PortfolioStats
 import pandas as pd
+from concurrent.futures import wait
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 
+# Cards rendered per "page" of the home grid
+PROJECTS_PER_PAGE = 10
+
+# Project buttons shown at once in the sidebar jump list
+SIDEBAR_JUMP_LIMIT = 8
+
+@lru_cache(maxsize=1024)
+def pill_html(text, color="#2563eb"):
+    return f"""<span style="background:{color};color:white;padding:4px 10px;border-radius:999px;margin-right:6px;font-size:12px;display:inline-block;margin-bottom:6px;">{escape(str(text))}</span>"""
+
 def pill(text, color="#2563eb"):
-    st.markdown(f"""<span style="background:{color};color:white;padding:4px 10px;border-radius:999px;margin-right:6px;font-size:12px;">{text}</span>""", unsafe_allow_html=True)
+    st.markdown(pill_html(text, color), unsafe_allow_html=True)
+
+@lru_cache(maxsize=4096)
+def tag_strip_html(tags, color="#2563eb"):
+    """HTML for a whole tag set, built once per tag tuple"""
+    return '<div style="line-height:2;">' + "".join(pill_html(tag, color) for tag in tags) + "</div>"
+
+def tag_strip(tags, color="#2563eb"):
+    """Render all tags as a single element"""
+    st.markdown(tag_strip_html(tuple(tags), color), unsafe_allow_html=True)
+
+@lru_cache(maxsize=256)
+def stat_strip_html(stats):
+    """HTML for a row of (label, value) metric boxes"""
+    boxes = "".join(
+        f"""<div class="metric-container" style="flex:1;min-width:140px;">
+            <div style="color:#6b7280;font-size:14px;">{escape(str(label))}</div>
+            <div style="color:#1f2937;font-size:2rem;font-weight:600;">{escape(str(value))}</div>
+        </div>"""
+        for label, value in stats
+    )
+    return f'<div style="display:flex;gap:16px;flex-wrap:wrap;margin-bottom:16px;">{boxes}</div>'
+
+def stat_strip(stats):
+    """Render several metrics as a single element"""
+    st.markdown(stat_strip_html(tuple(stats)), unsafe_allow_html=True)
 
 def render_navigation():
     """Add navigation breadcrumbs and back button"""
@@ -119,7 +161,8 @@ def render_about_section():
         st.write("- **Hindi:** Native")
 
 
-def render_home(projects):
+@timed("render_home")
+def render_home(projects, stats=None, paginate=True):
     """Enhanced home page with better navigation and about section"""
 
     # Add About section first
@@ -127,77 +170,81 @@ def render_home(projects):
 
     # Quick stats
     st.markdown("### 📊 Portfolio Overview")
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric("Total Projects", len(projects))
-
-    with col2:
-        ai_projects = len([p for p in projects if any('ai' in tag.lower() for tag in p.get('tags', []))])
-        st.metric("AI/ML Projects", ai_projects)
-
-    with col3:
-        nlp_projects = len([p for p in projects if any('nlp' in tag.lower() for tag in p.get('tags', []))])
-        st.metric("NLP Projects", nlp_projects)
-
-    with col4:
-        total_tags = len(set([tag for p in projects for tag in p.get('tags', [])]))
-        st.metric("Technologies", total_tags)
+    stat_strip(stats or PortfolioStats.from_projects(projects).summary())
 
     st.markdown("---")
 
     # Projects grid with improved cards
     st.markdown("### 🚀 Featured Projects")
 
-    for i in range(0, len(projects), 2):
+    # Only a window of cards is rendered; "Load more" grows it
+    visible = visible_project_count(projects) if paginate else len(projects)
+    shown = projects[:visible]
+
+    for i in range(0, len(shown), 2):
         cols = st.columns(2)
 
         for j, col in enumerate(cols):
-            if i + j < len(projects):
-                project = projects[i + j]
+            if i + j < len(shown):
+                project = shown[i + j]
 
                 with col:
                     render_project_card_clean(project, i + j + 1)
 
+    if visible < len(projects):
+        st.caption(f"Showing {visible} of {len(projects)} projects")
+        if st.button("⬇️ Load more projects", key="home_load_more", use_container_width=True):
+            st.session_state["home_grid"]["visible"] += PROJECTS_PER_PAGE
+            st.rerun()
+
+def visible_project_count(projects):
+    """How many cards to render; resets when the project list changes"""
+
+    signature = hash(tuple(p.key for p in projects))
+    grid = st.session_state.get("home_grid")
+    if not grid or grid["signature"] != signature:
+        grid = {"signature": signature, "visible": PROJECTS_PER_PAGE}
+        st.session_state["home_grid"] = grid
+    return min(grid["visible"], len(projects))
+
 def render_project_card_clean(project, index):
     """Render clean project card using only Streamlit components"""
 
     # Create a container with clean styling
     with st.container():
         # Project header
-        st.markdown(f"### {index}. {project['title']}")
+        st.markdown(f"### {index}. {project.title}")
 
         # Project summary
-        st.write(project['summary'])
+        st.write(project.summary)
 
         # Tags section
-        if project.get("tags"):
+        if project.tags:
             st.markdown("**🏷️ Technologies:**")
-            for tag in project["tags"]:
-                pill(tag)
-            st.markdown("")
+            tag_strip(project.tags)
 
         # Action buttons
         col1, col2 = st.columns([3, 1])
 
         with col1:
-            if st.button(f"🔍 Explore Project", key=f"explore_{project['key']}", use_container_width=True):
-                st.query_params["project"] = project["key"]
+            if st.button(f"🔍 Explore Project", key=f"explore_{project.key}", use_container_width=True):
+                st.query_params["project"] = project.key
                 st.rerun()
 
         with col2:
             # Quick info button
             with st.popover("ℹ️"):
                 st.write("**Quick Info:**")
-                if project.get("tools"):
-                    st.write("🛠️ **Tools:**", ", ".join(project["tools"][:3]))
-                if project.get("impact"):
-                    st.write("📈 **Key Impact:**", project["impact"][0] if project["impact"] else "N/A")
+                if project.tools:
+                    st.write("🛠️ **Tools:**", ", ".join(project.tools[:3]))
+                if project.impact:
+                    st.write("📈 **Key Impact:**", project.impact[0])
 
         # Add spacing between cards
         st.markdown("---")
 
-def render_project_page(project):
+@timed("render_project_page")
+def render_project_page(project, lazy_tabs=True):
     """Enhanced project page with better navigation and layout"""
 
     # Add navigation first
@@ -213,135 +260,178 @@ def render_project_page(project):
         margin-bottom: 30px;
         text-align: center;
     ">
-        <h1 style="margin: 0; font-size: 2.2rem;">{project["title"]}</h1>
-        <p style="margin: 15px 0 0 0; font-size: 1.1rem; opacity: 0.9;">{project.get("summary","")}</p>
+        <h1 style="margin: 0; font-size: 2.2rem;">{project.title}</h1>
+        <p style="margin: 15px 0 0 0; font-size: 1.1rem; opacity: 0.9;">{project.summary}</p>
     </div>
     """, unsafe_allow_html=True)
 
     # Tags with improved styling
-    if project.get("tags"):
+    if project.tags:
         st.markdown("### 🏷️ Technologies & Methods")
-        tag_cols = st.columns(len(project["tags"]))
-        for i, tag in enumerate(project["tags"]):
-            with tag_cols[i]:
-                pill(tag)
+        tag_strip(project.tags)
+
+    # Sections are rendered lazily by default: only the active one runs
+    if lazy_tabs:
+        labels = [label for label, _ in PROJECT_SECTIONS]
+        active = st.radio(
+            "Section",
+            labels,
+            horizontal=True,
+            key=f"section_{project.key}",
+            label_visibility="collapsed"
+        )
+        dict(PROJECT_SECTIONS)[active](project)
+    else:
+        tabs = st.tabs([label for label, _ in PROJECT_SECTIONS])
+        for tab, (_, render_section) in zip(tabs, PROJECT_SECTIONS):
+            with tab:
+                render_section(project)
+
+def render_overview_section(project):
+    """Objectives and categorized tools"""
+
+    # Objectives section
+    if project.objectives:
+        st.markdown("### 🎯 Project Objectives")
+        for i, obj in enumerate(project.objectives, 1):
+            st.markdown(f"**{i}.** {obj}")
         st.markdown("")
 
-    # Create tabs for better organization
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Overview", "🔄 Pipeline", "📊 Visualizations", "📈 Impact", "💼 Resources"])
-
-    with tab1:
-        # Objectives section
-        if project.get("objectives"):
-            st.markdown("### 🎯 Project Objectives")
-            for i, obj in enumerate(project.get("objectives", []), 1):
-                st.markdown(f"**{i}.** {obj}")
-            st.markdown("")
-
-        # Tools section with better formatting
-        if project.get("tools"):
-            st.markdown("### 🛠️ Tools & Technologies")
-
-            # Categorize tools
-            tool_categories = {
-                "Programming": [t for t in project["tools"] if any(lang in t.lower() for lang in ['python', 'sql', 'r'])],
-                "AI/ML": [t for t in project["tools"] if any(ai in t.lower() for ai in ['ai', 'ml', 'powerapp', 'azure'])],
-                "Data": [t for t in project["tools"] if any(data in t.lower() for data in ['excel', 'csv', 'db', 'database'])],
-                "Other": []
-            }
-
-            # Assign remaining tools to "Other"
-            assigned_tools = [tool for category in tool_categories.values() for tool in category]
-            tool_categories["Other"] = [t for t in project["tools"] if t not in assigned_tools]
-
-            for category, tools in tool_categories.items():
-                if tools:
-                    st.markdown(f"**{category}:**")
-                    for tool in tools:
-                        st.markdown(f"• {tool}")
-
-    with tab2:
-        st.markdown("### 🔄 Pipeline Architecture")
-        render_flow(project.get("diagram", {}))
-
-    with tab3:
-        if project.get("visuals"):
-            st.markdown("### 📊 Interactive Data Visualizations")
-            for i, viz in enumerate(project["visuals"]):
-                st.markdown(f"#### 📈 {viz.get('title', f'Visualization {i+1}')}")
+    # Tools section with better formatting
+    if project.tools:
+        st.markdown("### 🛠️ Tools & Technologies")
+
+        # Categorize tools
+        tool_categories = {
+            "Programming": [t for t in project.tools if any(lang in t.lower() for lang in ['python', 'sql', 'r'])],
+            "AI/ML": [t for t in project.tools if any(ai in t.lower() for ai in ['ai', 'ml', 'powerapp', 'azure'])],
+            "Data": [t for t in project.tools if any(data in t.lower() for data in ['excel', 'csv', 'db', 'database'])],
+            "Other": []
+        }
+
+        # Assign remaining tools to "Other"
+        assigned_tools = [tool for category in tool_categories.values() for tool in category]
+        tool_categories["Other"] = [t for t in project.tools if t not in assigned_tools]
+
+        for category, tools in tool_categories.items():
+            if tools:
+                st.markdown(f"**{category}:**")
+                for tool in tools:
+                    st.markdown(f"• {tool}")
+
+def render_pipeline_section(project):
+    """Pipeline diagram"""
+
+    st.markdown("### 🔄 Pipeline Architecture")
+    render_flow(project.diagram)
+
+def render_visuals_section(project):
+    """Interactive charts for every visual"""
+
+    if project.visuals:
+        st.markdown("### 📊 Interactive Data Visualizations")
+
+        # Read every data file in parallel (once each, however many visuals
+        # slice it) while placeholders hold each chart's place
+        loads = dataset_registry.prepare(project.visuals)
+        titles = [viz.get('title', f'Visualization {i+1}') for i, viz in enumerate(project.visuals)]
+        placeholders = []
+        for title in titles:
+            placeholder = st.empty()
+            placeholder.info(f"⏳ Loading {title}…")
+            placeholders.append(placeholder)
+
+        # Charts fill in, in order, as their data arrives; read errors
+        # surface in render_chart
+        for viz, title, load, placeholder in zip(project.visuals, titles, loads, placeholders):
+            if load is not None:
+                wait([load])
+            with placeholder.container():
+                st.markdown(f"#### 📈 {title}")
                 render_chart(viz)
                 st.markdown("---")
-        else:
-            st.info("📊 Visualizations will be added as data becomes available.")
-
-    with tab4:
-        if project.get("impact"):
-            st.markdown("### 📈 Project Impact & Results")
-
-            # Display impact in cards
-            for i, impact_item in enumerate(project["impact"]):
-                impact_type = "efficiency" if "efficiency" in impact_item.lower() else "accuracy" if "accuracy" in impact_item.lower() else "general"
-
-                icon_map = {
-                    "efficiency": "⚡",
-                    "accuracy": "🎯",
-                    "general": "📈"
-                }
-
-                color_map = {
-                    "efficiency": "#10b981",
-                    "accuracy": "#3b82f6",
-                    "general": "#8b5cf6"
-                }
-
-                st.markdown(f"""
-                <div style="
-                    background: {color_map[impact_type]}15;
-                    border-left: 4px solid {color_map[impact_type]};
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-radius: 5px;
-                ">
-                    <strong>{icon_map[impact_type]} {impact_item}</strong>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("📈 Impact metrics will be added upon project completion.")
-
-    with tab5:
-        if project.get("downloads"):
-            st.markdown("### 💾 Download Resources")
-
-            for download in project["downloads"]:
-                path = Path(download["path"])
-                if path.exists():
-                    with open(path, "rb") as f:
-                        st.download_button(
-                            f"📁 {download['label']}",
-                            data=f.read(),
-                            file_name=path.name,
-                            mime="text/csv" if path.suffix == ".csv" else "application/octet-stream"
-                        )
-                else:
-                    st.info(f"📁 {download['label']} (file will be available soon)")
-        else:
-            st.info("📁 Downloadable resources will be added as they become available.")
+    else:
+        st.info("📊 Visualizations will be added as data becomes available.")
 
-        # Add project metadata
-        st.markdown("---")
-        st.markdown("### 📋 Project Metadata")
+def render_impact_section(project):
+    """Impact highlights as colored cards"""
 
-        metadata_col1, metadata_col2 = st.columns(2)
+    if project.impact:
+        st.markdown("### 📈 Project Impact & Results")
 
-        with metadata_col1:
-            st.markdown("**🔑 Project Key:** `" + project.get("key", "N/A") + "`")
-            st.markdown("**📊 Visualization Count:** " + str(len(project.get("visuals", []))))
+        # Display impact in cards
+        for i, impact_item in enumerate(project.impact):
+            impact_type = "efficiency" if "efficiency" in impact_item.lower() else "accuracy" if "accuracy" in impact_item.lower() else "general"
 
-        with metadata_col2:
-            st.markdown("**🏷️ Tag Count:** " + str(len(project.get("tags", []))))
-            st.markdown("**🎯 Objective Count:** " + str(len(project.get("objectives", []))))
+            icon_map = {
+                "efficiency": "⚡",
+                "accuracy": "🎯",
+                "general": "📈"
+            }
+
+            color_map = {
+                "efficiency": "#10b981",
+                "accuracy": "#3b82f6",
+                "general": "#8b5cf6"
+            }
+
+            st.markdown(f"""
+            <div style="
+                background: {color_map[impact_type]}15;
+                border-left: 4px solid {color_map[impact_type]};
+                padding: 15px;
+                margin: 10px 0;
+                border-radius: 5px;
+            ">
+                <strong>{icon_map[impact_type]} {impact_item}</strong>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("📈 Impact metrics will be added upon project completion.")
+
+def render_resources_section(project):
+    """Downloads and project metadata"""
+
+    if project.downloads:
+        st.markdown("### 💾 Download Resources")
+
+        for download in project.downloads:
+            path = Path(download.path)
+            if path.exists():
+                # Bytes are only read once the visitor asks for the file
+                render_file_download(
+                    f"📁 {download.label}",
+                    path,
+                    key=f"{project.key}_{path.as_posix()}"
+                )
+            else:
+                st.info(f"📁 {download.label} (file will be available soon)")
+    else:
+        st.info("📁 Downloadable resources will be added as they become available.")
+
+    # Add project metadata
+    st.markdown("---")
+    st.markdown("### 📋 Project Metadata")
+
+    metadata_col1, metadata_col2 = st.columns(2)
+
+    with metadata_col1:
+        st.markdown("**🔑 Project Key:** `" + project.key + "`")
+        st.markdown("**📊 Visualization Count:** " + str(len(project.visuals)))
+
+    with metadata_col2:
+        st.markdown("**🏷️ Tag Count:** " + str(len(project.tags)))
+        st.markdown("**🎯 Objective Count:** " + str(len(project.objectives)))
 
-def add_sidebar_navigation(projects):
+PROJECT_SECTIONS = [
+    ("📋 Overview", render_overview_section),
+    ("🔄 Pipeline", render_pipeline_section),
+    ("📊 Visualizations", render_visuals_section),
+    ("📈 Impact", render_impact_section),
+    ("💼 Resources", render_resources_section),
+]
+
+def add_sidebar_navigation(projects, index=None):
     """Add clean sidebar navigation WITHOUT extra empty lines"""
 
     with st.sidebar:
@@ -354,13 +444,32 @@ def add_sidebar_navigation(projects):
 
         st.markdown("---")
 
-        # Project quick links
+        # Project quick links: searchable, and only a window of buttons
         st.markdown("### 🚀 Quick Jump to Projects")
 
-        for i, project in enumerate(projects, 1):
-            if st.button(f"{i}. {project['title']}", key=f"sidebar_{project['key']}", use_container_width=True):
-                st.query_params["project"] = project["key"]
+        jump_query = st.text_input(
+            "Find a project",
+            key="jump_filter",
+            placeholder="Type to search titles...",
+            label_visibility="collapsed"
+        )
+
+        if not jump_query:
+            matches = projects
+        elif index is not None:
+            matches = index.filter((), jump_query)
+        else:
+            matches = [p for p in projects if jump_query.lower() in p.title.lower()]
+
+        for i, project in enumerate(matches[:SIDEBAR_JUMP_LIMIT], 1):
+            if st.button(f"{i}. {project.title}", key=f"sidebar_{project.key}", use_container_width=True):
+                st.query_params["project"] = project.key
                 st.rerun()
 
+        if len(matches) > SIDEBAR_JUMP_LIMIT:
+            st.caption(f"…and {len(matches) - SIDEBAR_JUMP_LIMIT} more. Refine the search to find them.")
+        elif not matches:
+            st.caption("No matching projects.")
+
         # Only add separator if there are filters below
         # REMOVED extra st.markdown("---") to eliminate empty space
@@ -0,0 +1,89 @@
+"""Classifying pipeline steps into visual styles.
+
+A node gets the style of the first rule whose keyword appears in its name
+(case-insensitive). Projects can add their own rules, checked before the
+defaults, under `node_styles` in the diagram YAML:
+
+    diagram:
+      type: flow
+      node_styles:
+        - match: [n8n, orchestration]
+          type: Orchestration
+          icon: "🛰️"
+          color: "#0ea5e9"
+          border: "#0369a1"
+          description: Workflow orchestration
+
+Missing fields fall back to the default style.
+"""
+
+import json, re, threading
+
+DEFAULT_NODE_RULES = [
+    ('input', {'color': '#10b981', 'border': '#065f46', 'icon': '📥', 'type': 'Input', 'description': 'Data ingestion and collection'}),
+    ('preprocessing', {'color': '#3b82f6', 'border': '#1e40af', 'icon': '🔧', 'type': 'Processing', 'description': 'Data cleaning and standardization'}),
+    ('keyword', {'color': '#f59e0b', 'border': '#92400e', 'icon': '🎯', 'type': 'Matching', 'description': 'Rule-based pattern matching'}),
+    ('ai', {'color': '#8b5cf6', 'border': '#5b21b6', 'icon': '🤖', 'type': 'AI/ML', 'description': 'AI-powered classification'}),
+    ('validation', {'color': '#06d6a0', 'border': '#047857', 'icon': '✅', 'type': 'Validation', 'description': 'Quality assurance'}),
+    ('output', {'color': '#fb923c', 'border': '#c2410c', 'icon': '📤', 'type': 'Output', 'description': 'Result generation'}),
+    ('automation', {'color': '#ef4444', 'border': '#991b1b', 'icon': '⚙️', 'type': 'Automation', 'description': 'Automated processing'}),
+]
+
+DEFAULT_NODE_STYLE = {'color': '#6b7280', 'border': '#374151', 'icon': '🔹', 'type': 'Process', 'description': 'Data processing step'}
+
+STYLE_FIELDS = tuple(DEFAULT_NODE_STYLE)
+
+class NodeClassifier:
+    """Matches node names against all rule keywords with one compiled regex"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._priority = {}
+        for index, (keyword, _) in enumerate(rules):
+            self._priority.setdefault(keyword, index)
+
+        # A zero-width lookahead reports, at every position, the first listed
+        # keyword starting there; the lowest index over all positions wins
+        keywords = "|".join(re.escape(keyword) for keyword in self._priority)
+        self._pattern = re.compile(f"(?=({keywords}))") if keywords else None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def classify(self, node):
+        cached = self._cache.get(node)
+        if cached is not None:
+            return cached
+
+        style = DEFAULT_NODE_STYLE
+        if self._pattern:
+            matches = [self._priority[m.group(1)] for m in self._pattern.finditer(node.lower())]
+            if matches:
+                style = self.rules[min(matches)][1]
+
+        with self._lock:
+            self._cache[node] = style
+        return style
+
+def compile_rules(node_styles):
+    """Project rules (from YAML) followed by the default rules"""
+
+    rules = []
+    for entry in node_styles or []:
+        style = {field: entry.get(field, DEFAULT_NODE_STYLE[field]) for field in STYLE_FIELDS}
+        keywords = entry.get("match") or []
+        for keyword in [keywords] if isinstance(keywords, str) else keywords:
+            if keyword:
+                rules.append((str(keyword).lower(), style))
+    return rules + DEFAULT_NODE_RULES
+
+_classifiers = {}
+_classifiers_lock = threading.Lock()
+
+def get_classifier(node_styles=None):
+    """Shared classifier for a set of project rules"""
+
+    key = json.dumps(node_styles or [], sort_keys=True, default=str)
+    with _classifiers_lock:
+        if key not in _classifiers:
+            _classifiers[key] = NodeClassifier(compile_rules(node_styles))
+        return _classifiers[key]
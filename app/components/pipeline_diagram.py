@@ -1,28 +1,37 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
-import math
-
+import hashlib, json
+import numpy as np
+from components.figure_cache import figure_cache
+from components.figure_payload import figure_json
+from components.flow_layout import layered_layout
+from components.node_styles import get_classifier
+from components.instrumentation import metrics, timed
+
+@timed("render_flow")
 def render_flow(diagram):
     """Render interactive visual pipeline using Plotly with better spacing"""
 
-    if not diagram or diagram.get("type") != "flow":
+    if not diagram or diagram.type != "flow":
         st.info("No pipeline diagram available.")
         return
 
-    nodes = diagram.get("nodes", [])
-    edges = diagram.get("edges", [])
+    nodes = diagram.nodes
+    edges = diagram.edges
+    node_styles = diagram.node_styles
 
     if not nodes:
         st.info("No nodes defined in diagram.")
         return
 
     # Create interactive visual flow with improved spacing
-    create_interactive_flow_chart(nodes, edges)
+    create_interactive_flow_chart(nodes, edges, node_styles)
 
-def create_interactive_flow_chart(nodes, edges):
-    """Create a beautiful interactive flow chart with better spacing"""
+def build_flow_figure(nodes, edges, node_styles=None):
+    """Build the pipeline flow figure for a list of nodes and edges"""
 
     # Calculate positions for vertical flow with more spacing
     positions = calculate_flow_positions(nodes, edges)
@@ -31,51 +40,64 @@ def create_interactive_flow_chart(nodes, edges):
     fig = go.Figure()
 
     # Add connecting lines first (so they appear behind nodes)
-    add_flow_connections(fig, positions, edges)
+    add_flow_connections(fig, positions, edges, calculate_edge_routes(nodes, edges))
 
     # Add nodes
-    add_interactive_nodes(fig, positions, nodes)
+    add_interactive_nodes(fig, positions, nodes, node_styles)
 
     # Style the chart with more height
-    style_flow_chart(fig, len(nodes))
+    style_flow_chart(fig, positions)
 
-    # Display
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': True})
+    return fig
 
-    # Add interactive legend
-    add_interactive_legend(nodes)
+def diagram_key(nodes, edges, node_styles=None):
+    """Stable cache key for a diagram's content"""
+    payload = json.dumps(
+        {"nodes": nodes, "edges": edges, "node_styles": node_styles},
+        sort_keys=True,
+        default=str
+    )
+    return "flow:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-def calculate_flow_positions(nodes, edges):
-    """Calculate optimal positions for nodes in a flow with better spacing"""
+def flow_entry(nodes, edges, node_styles=None):
+    """Cached {"figure": json} for a diagram, built once and shared across sessions"""
 
-    positions = {}
+    def build():
+        metrics.count("flow_builds")
+        return {"figure": figure_json(build_flow_figure(nodes, edges, node_styles), "diagram")}
 
-    # Check if we have parallel processes
-    parallel_steps = identify_parallel_steps(nodes)
+    return figure_cache.get_or_build(diagram_key(nodes, edges, node_styles), build)
 
-    if parallel_steps:
-        # Handle parallel processing layout with more spacing
-        positions = calculate_parallel_layout(nodes, parallel_steps)
-    else:
-        # Simple vertical layout with increased spacing
-        positions = calculate_vertical_layout(nodes)
+def create_interactive_flow_chart(nodes, edges, node_styles=None):
+    """Create a beautiful interactive flow chart with better spacing"""
 
-    return positions
+    fig = pio.from_json(flow_entry(nodes, edges, node_styles)["figure"])
 
-def identify_parallel_steps(nodes):
-    """Identify steps that should be shown in parallel"""
-    parallel_groups = []
+    # Display
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': True})
 
-    # Look for keyword matching steps
-    keyword_steps = [n for n in nodes if any(word in n.lower() for word in ['exact', 'fuzzy', 'partial', 'synonym'])]
+    # Add interactive legend
+    add_interactive_legend(nodes, node_styles)
 
-    if len(keyword_steps) > 1:
-        parallel_groups.append({
-            'steps': keyword_steps,
-            'after_step': next((n for n in nodes if 'keyword' in n.lower() and n not in keyword_steps), None)
-        })
+def diagram_layout(nodes, edges):
+    """Layered DAG layout, cached per diagram"""
+    return layered_layout(
+        tuple(nodes),
+        tuple(tuple(edge) for edge in edges if len(edge) == 2)
+    )
 
-    return parallel_groups
+def calculate_flow_positions(nodes, edges):
+    """Calculate node positions from the diagram's edge graph"""
+
+    if edges:
+        return diagram_layout(nodes, edges).positions
+
+    # Without edges, keep the listed order top to bottom
+    return calculate_vertical_layout(nodes)
+
+def calculate_edge_routes(nodes, edges):
+    """Bend points of the edges the layout routed around other layers"""
+    return diagram_layout(nodes, edges).routes if edges else {}
 
 def calculate_vertical_layout(nodes):
     """Calculate positions for simple vertical flow with more spacing"""
@@ -93,202 +115,177 @@ def calculate_vertical_layout(nodes):
 
     return positions
 
-def calculate_parallel_layout(nodes, parallel_groups):
-    """Calculate positions for layout with parallel processing and better spacing"""
-    positions = {}
-    vertical_spacing = 3.0  # Increased spacing
-    current_y = len(nodes) * vertical_spacing
-
-    for i, node in enumerate(nodes):
-        # Check if this node is part of parallel processing
-        is_parallel = False
-        parallel_index = 0
-
-        for group in parallel_groups:
-            if node in group['steps']:
-                is_parallel = True
-                parallel_index = group['steps'].index(node)
-                num_parallel = len(group['steps'])
-
-                # Position parallel steps horizontally with more spacing
-                x_offset = (parallel_index - (num_parallel - 1) / 2) * 3.0  # Increased horizontal spacing
-                positions[node] = {
-                    'x': x_offset,
-                    'y': current_y - vertical_spacing,
-                    'level': i,
-                    'is_parallel': True
-                }
-                break
-
-        if not is_parallel:
-            positions[node] = {
-                'x': 0,
-                'y': current_y,
-                'level': i,
-                'is_parallel': False
-            }
-            current_y -= vertical_spacing * 1.5  # Extra space for main flow steps
-
-    return positions
-
-def add_flow_connections(fig, positions, edges):
-    """Add connecting lines between nodes"""
-
-    # Create smooth curved connections
-    for edge in edges:
-        if len(edge) == 2 and edge[0] in positions and edge[1] in positions:
-
-            start_pos = positions[edge[0]]
-            end_pos = positions[edge[1]]
-
-            # Create curved line
-            x_curve, y_curve = create_curved_line(
-                start_pos['x'], start_pos['y'],
-                end_pos['x'], end_pos['y']
-            )
-
-            fig.add_trace(go.Scatter(
-                x=x_curve,
-                y=y_curve,
-                mode='lines',
-                line=dict(
-                    color='#3b82f6',
-                    width=3,
-                    shape='spline'
-                ),
-                hoverinfo='skip',
-                showlegend=False,
-                name='Flow'
-            ))
-
-            # Add arrow at end
-            add_arrow(fig, end_pos['x'], end_pos['y'], start_pos['x'], start_pos['y'])
-
-def create_curved_line(x1, y1, x2, y2):
-    """Create smooth curved line between two points"""
-
-    # Simple curve using control points
-    steps = 20
-    x_curve = []
-    y_curve = []
-
-    for i in range(steps + 1):
-        t = i / steps
-
-        # Bezier curve with control point offset
-        control_x = (x1 + x2) / 2
-        control_y = (y1 + y2) / 2 + 0.5  # Slightly more curve
-
-        x = (1-t)**2 * x1 + 2*(1-t)*t * control_x + t**2 * x2
-        y = (1-t)**2 * y1 + 2*(1-t)*t * control_y + t**2 * y2
-
-        x_curve.append(x)
-        y_curve.append(y)
-
-    return x_curve, y_curve
-
-def add_arrow(fig, x, y, from_x, from_y):
-    """Add smaller arrow pointing to node"""
-
-    # Calculate arrow direction
-    dx = x - from_x
-    dy = y - from_y
-    length = math.sqrt(dx**2 + dy**2)
-
-    if length > 0:
-        # Normalize direction
-        dx /= length
-        dy /= length
-
-        # SMALLER arrow size - reduced from 0.3 to 0.15
-        arrow_size = 0.15
-
-        # Arrow points
-        arrow_x = [x - dx * arrow_size, x, x - dx * arrow_size]
-        arrow_y = [y - dy * arrow_size + arrow_size/2, y, y - dy * arrow_size - arrow_size/2]
-
-        fig.add_trace(go.Scatter(
-            x=arrow_x,
-            y=arrow_y,
-            mode='lines',
-            line=dict(color='#3b82f6', width=3),
-            fill='toself',
-            fillcolor='#3b82f6',
-            hoverinfo='skip',
-            showlegend=False
-        ))
-
-def add_interactive_nodes(fig, positions, nodes):
-    """Add interactive nodes to the chart"""
+CURVE_STEPS = 20
+CURVE_LIFT = 0.5
+ARROW_SIZE = 0.15
+
+def with_gaps(points):
+    """Flatten an (n, k) array into one list with None between rows"""
+    gapped = np.full((points.shape[0], points.shape[1] + 1), np.nan)
+    gapped[:, :-1] = points
+    return [None if v != v else v for v in gapped.ravel().tolist()]
+
+def edge_endpoints(positions, edges):
+    """(starts, ends) coordinate arrays for every drawable edge"""
+    pairs = [
+        (positions[edge[0]], positions[edge[1]])
+        for edge in edges
+        if len(edge) == 2 and edge[0] in positions and edge[1] in positions
+    ]
+    starts = np.array([[s['x'], s['y']] for s, _ in pairs], dtype=float).reshape(-1, 2)
+    ends = np.array([[e['x'], e['y']] for _, e in pairs], dtype=float).reshape(-1, 2)
+    return starts, ends
+
+def routed_lines(positions, edges, routes):
+    """None-separated x and y lists through each routed edge's bend points,
+    plus (tails, tips) arrays for the arrow on its last segment"""
+
+    xs, ys, tails, tips = [], [], [], []
+    for source, target in edges:
+        start, end = positions[source], positions[target]
+        path = [(start['x'], start['y'])] + list(routes[(source, target)]) + [(end['x'], end['y'])]
+        xs += [p[0] for p in path] + [None]
+        ys += [p[1] for p in path] + [None]
+        tails.append(path[-2])
+        tips.append(path[-1])
+    return xs, ys, np.array(tails, dtype=float).reshape(-1, 2), np.array(tips, dtype=float).reshape(-1, 2)
+
+def add_flow_connections(fig, positions, edges, routes=None):
+    """Add all connecting lines and arrowheads as two traces.
+
+    Edges with bend points in `routes` follow them; the rest are drawn
+    as a single curve from source to target.
+    """
+
+    routes = routes or {}
+    drawable = [
+        tuple(edge) for edge in edges
+        if len(edge) == 2 and edge[0] in positions and edge[1] in positions
+    ]
+    routed = [edge for edge in drawable if edge in routes]
+    starts, ends = edge_endpoints(positions, [edge for edge in drawable if edge not in routes])
+    if not len(starts) and not routed:
+        return
 
-    for node in nodes:
-        pos = positions[node]
-        config = get_node_config(node)
-
-        # Add node circle - slightly larger for better visibility
-        fig.add_trace(go.Scatter(
-            x=[pos['x']],
-            y=[pos['y']],
-            mode='markers+text',
-            marker=dict(
-                size=90,  # Increased from 80
-                color=config['color'],
-                line=dict(color=config['border'], width=4),  # Thicker border
-                symbol='circle'
-            ),
-            text=config['icon'],
-            textfont=dict(size=28, color='white'),  # Larger icons
-            textposition='middle center',
-            hovertemplate=f"""
-            <b>{node}</b><br>
-            Type: {config['type']}<br>
-            Description: {config['description']}<br>
-            <extra></extra>
-            """,
-            name=config['type'],
-            showlegend=False
-        ))
-
-        # Add text label below node - with more spacing
-        fig.add_trace(go.Scatter(
-            x=[pos['x']],
-            y=[pos['y'] - 1.0],  # Increased from -0.6
-            mode='text',
-            text=[f"<b>{node}</b>"],
-            textfont=dict(size=13, color='#1f2937'),  # Slightly larger text
-            textposition='middle center',
-            hoverinfo='skip',
-            showlegend=False
-        ))
-
-def get_node_config(node):
+    # Create smooth curved connections, one None-separated line trace;
+    # the spline line shape also smooths the routed paths
+    x_curves, y_curves = create_curved_lines(starts, ends)
+    routed_x, routed_y, tails, tips = routed_lines(positions, routed, routes)
+    fig.add_trace(go.Scatter(
+        x=with_gaps(x_curves) + routed_x,
+        y=with_gaps(y_curves) + routed_y,
+        mode='lines',
+        line=dict(
+            color='#3b82f6',
+            width=3,
+            shape='spline'
+        ),
+        hoverinfo='skip',
+        showlegend=False,
+        name='Flow'
+    ))
+
+    # Add arrows at the ends; 'toself' fills each gap-separated polygon
+    arrow_x, arrow_y = create_arrows(np.vstack([ends, tips]), np.vstack([starts, tails]))
+    fig.add_trace(go.Scatter(
+        x=with_gaps(arrow_x),
+        y=with_gaps(arrow_y),
+        mode='lines',
+        line=dict(color='#3b82f6', width=3),
+        fill='toself',
+        fillcolor='#3b82f6',
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+def create_curved_lines(starts, ends):
+    """Quadratic Bezier curves for many edges at once, as (n, steps + 1) x and y arrays"""
+
+    t = np.linspace(0.0, 1.0, CURVE_STEPS + 1)
+    w_start = (1 - t) ** 2
+    w_control = 2 * (1 - t) * t
+    w_end = t ** 2
+
+    # Control point sits between the ends, lifted for a slight curve
+    control = (starts + ends) / 2
+    control[:, 1] += CURVE_LIFT
+
+    x = np.outer(starts[:, 0], w_start) + np.outer(control[:, 0], w_control) + np.outer(ends[:, 0], w_end)
+    y = np.outer(starts[:, 1], w_start) + np.outer(control[:, 1], w_control) + np.outer(ends[:, 1], w_end)
+    return x, y
+
+def create_arrows(tips, tails):
+    """Triangle outlines pointing at each tip, as (n, 3) x and y arrays"""
+
+    direction = tips - tails
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    keep = length > 0
+    direction = direction[keep] / length[keep, None]
+    tips = tips[keep]
+
+    base = tips - direction * ARROW_SIZE
+    x = np.column_stack([base[:, 0], tips[:, 0], base[:, 0]])
+    y = np.column_stack([base[:, 1] + ARROW_SIZE / 2, tips[:, 1], base[:, 1] - ARROW_SIZE / 2])
+    return x, y
+
+def add_interactive_nodes(fig, positions, nodes, node_styles=None):
+    """Add all node markers and all labels as two traces"""
+
+    classifier = get_classifier(node_styles)
+    configs = [classifier.classify(node) for node in nodes]
+    xs = [positions[node]['x'] for node in nodes]
+    ys = [positions[node]['y'] for node in nodes]
+
+    # Node circles - slightly larger for better visibility
+    fig.add_trace(go.Scatter(
+        x=xs,
+        y=ys,
+        mode='markers+text',
+        marker=dict(
+            size=90,
+            color=[c['color'] for c in configs],
+            line=dict(color=[c['border'] for c in configs], width=4),
+            symbol='circle'
+        ),
+        text=[c['icon'] for c in configs],
+        textfont=dict(size=28, color='white'),
+        textposition='middle center',
+        customdata=[[node, c['type'], c['description']] for node, c in zip(nodes, configs)],
+        hovertemplate=(
+            "<b>%{customdata[0]}</b><br>"
+            "Type: %{customdata[1]}<br>"
+            "Description: %{customdata[2]}<br>"
+            "<extra></extra>"
+        ),
+        name='Steps',
+        showlegend=False
+    ))
+
+    # Text labels below the nodes
+    fig.add_trace(go.Scatter(
+        x=xs,
+        y=[y - 1.0 for y in ys],
+        mode='text',
+        text=[f"<b>{node}</b>" for node in nodes],
+        textfont=dict(size=13, color='#1f2937'),
+        textposition='middle center',
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+def get_node_config(node, node_styles=None):
     """Get visual configuration for each node type"""
+    return get_classifier(node_styles).classify(node)
 
-    node_lower = node.lower()
-
-    configs = {
-        'input': {'color': '#10b981', 'border': '#065f46', 'icon': '📥', 'type': 'Input', 'description': 'Data ingestion and collection'},
-        'preprocessing': {'color': '#3b82f6', 'border': '#1e40af', 'icon': '🔧', 'type': 'Processing', 'description': 'Data cleaning and standardization'},
-        'keyword': {'color': '#f59e0b', 'border': '#92400e', 'icon': '🎯', 'type': 'Matching', 'description': 'Rule-based pattern matching'},
-        'ai': {'color': '#8b5cf6', 'border': '#5b21b6', 'icon': '🤖', 'type': 'AI/ML', 'description': 'AI-powered classification'},
-        'validation': {'color': '#06d6a0', 'border': '#047857', 'icon': '✅', 'type': 'Validation', 'description': 'Quality assurance'},
-        'output': {'color': '#fb923c', 'border': '#c2410c', 'icon': '📤', 'type': 'Output', 'description': 'Result generation'},
-        'automation': {'color': '#ef4444', 'border': '#991b1b', 'icon': '⚙️', 'type': 'Automation', 'description': 'Automated processing'}
-    }
-
-    # Match node to configuration
-    for key, config in configs.items():
-        if key in node_lower:
-            return config
-
-    # Default
-    return {'color': '#6b7280', 'border': '#374151', 'icon': '🔹', 'type': 'Process', 'description': 'Data processing step'}
+def style_flow_chart(fig, positions):
+    """Apply styling to the flow chart with dynamic height and width"""
 
-def style_flow_chart(fig, num_nodes):
-    """Apply styling to the flow chart with dynamic height"""
+    # Calculate height based on number of layers and spacing
+    num_levels = len({pos['level'] for pos in positions.values()})
+    chart_height = max(600, num_levels * 150)  # More height per level
 
-    # Calculate height based on number of nodes and spacing
-    chart_height = max(600, num_nodes * 150)  # More height per node
+    # Fit the widest layer, but never narrower than the default range
+    half_width = max([5] + [abs(pos['x']) + 2 for pos in positions.values()])
 
     fig.update_layout(
         title={
@@ -306,7 +303,7 @@ def style_flow_chart(fig, num_nodes):
             showgrid=False,
             showticklabels=False,
             zeroline=False,
-            range=[-5, 5]  # Wider range for better spacing
+            range=[-half_width, half_width]
         ),
         yaxis=dict(
             showgrid=False,
@@ -326,24 +323,24 @@ def style_flow_chart(fig, num_nodes):
         ]
     )
 
-def add_interactive_legend(nodes):
+def add_interactive_legend(nodes, node_styles=None):
     """Add interactive legend showing step types"""
 
     st.markdown("### 🎨 Step Types")
 
-    # Count step types
+    # Count step types in one pass, remembering each type's first style
+    classifier = get_classifier(node_styles)
     step_types = {}
     for node in nodes:
-        config = get_node_config(node)
-        step_type = config['type']
-        step_types[step_type] = step_types.get(step_type, 0) + 1
+        config = classifier.classify(node)
+        entry = step_types.setdefault(config['type'], [config, 0])
+        entry[1] += 1
 
     # Display legend in columns
     cols = st.columns(len(step_types))
 
-    for i, (step_type, count) in enumerate(step_types.items()):
+    for i, (step_type, (config, count)) in enumerate(step_types.items()):
         with cols[i]:
-            config = next(get_node_config(node) for node in nodes if get_node_config(node)['type'] == step_type)
             st.markdown(f"""
             **{config['icon']} {step_type}**  
             *{count} step{'s' if count != 1 else ''}*
@@ -0,0 +1,89 @@
+"""Building every chart and diagram ahead of the first visitor.
+
+Enable it with the PORTFOLIO_PREWARM=1 environment variable. The app then
+starts one background run per process that fills the shared figure cache
+(and the diagram layout cache) from a thread pool; progress and timing are
+kept in `prewarm_status` and shown in the ?debug=1 sidebar.
+
+Threads rather than processes are used because the caches live in this
+process's memory.
+"""
+
+import logging, os, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from components.charts import chart_entry
+from components.figure_cache import figure_cache
+from components.pipeline_diagram import flow_entry
+
+logger = logging.getLogger(__name__)
+
+PREWARM_ENV = "PORTFOLIO_PREWARM"
+PREWARM_WORKERS = 4
+
+prewarm_status = {"state": "idle"}
+_started = False
+_started_lock = threading.Lock()
+
+def prewarm_jobs(projects):
+    """(label, callable) for every visual with data and every flow diagram"""
+
+    jobs = []
+    for project in projects:
+        for visual in project.visuals:
+            if Path(visual["data_path"]).exists():
+                jobs.append((f"{project.key}: {visual.get('title', 'chart')}", lambda v=visual: chart_entry(v)))
+
+        diagram = project.diagram
+        if diagram and diagram.type == "flow" and diagram.nodes:
+            jobs.append((
+                f"{project.key}: diagram",
+                lambda d=diagram: flow_entry(d.nodes, d.edges, d.node_styles)
+            ))
+    return jobs
+
+def prewarm(projects, workers=PREWARM_WORKERS, progress=None):
+    """Build all figures in a thread pool; progress(done, total, label) after each"""
+
+    jobs = prewarm_jobs(projects)
+    if len(jobs) > figure_cache.maxsize:
+        logger.warning("Prewarming %d figures into a cache of %d; the oldest will be evicted", len(jobs), figure_cache.maxsize)
+
+    start = time.perf_counter()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build): label for label, build in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            label = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(label)
+                logger.warning("Prewarm failed for %s: %s", label, e)
+            if progress:
+                progress(done, len(jobs), label)
+
+    return {"total": len(jobs), "failed": failed, "seconds": time.perf_counter() - start}
+
+def start_prewarm(projects, workers=PREWARM_WORKERS):
+    """Start the background prewarm once per process, if enabled"""
+
+    global _started
+    if os.environ.get(PREWARM_ENV) != "1":
+        return
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+
+    def progress(done, total, label):
+        prewarm_status.update(done=done, total=total, last=label)
+
+    def run():
+        prewarm_status.update(state="running", done=0, total=0)
+        report = prewarm(projects, workers, progress)
+        prewarm_status.update(state="done", **report)
+        logger.info("Prewarmed %d figures in %.1fs (%d failed)", report["total"], report["seconds"], len(report["failed"]))
+
+    threading.Thread(target=run, name="portfolio-prewarm", daemon=True).start()
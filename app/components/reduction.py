@@ -0,0 +1,212 @@
+"""Shrinking chart data on the server before it is handed to Plotly.
+
+Every figure sent to the browser carries its rows, so large datasets are
+reduced first. Optional spec keys:
+
+    aggregate:  bar/pie - how rows sharing x (and color) are combined
+                ("sum", "mean", "max", ...); false keeps every row
+    max_points: line/scatter - points kept across all colors (at least two
+                per line series); histogram - rows allowed before binning
+    downsample: line - "lttb" (default) or "minmax"
+    reduce:     scatter - "sample" (default) or "bin"
+    bins:       histogram - bin count used when pre-binning large data
+    hover_data: columns shown on hover (defaults to the plotted columns)
+"""
+
+import numpy as np
+import pandas as pd
+
+LINE_MAX_POINTS = 2000
+SCATTER_MAX_POINTS = 5000
+HISTOGRAM_MAX_ROWS = 10000
+HISTOGRAM_BINS = 50
+
+# Number of raw points behind each binned scatter point
+BIN_COUNT_COLUMN = "points"
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+REDUCE_METHODS = ("sample", "bin")
+AGGREGATES = ("sum", "mean", "median", "min", "max", "count", "nunique", "first", "last", "std", "var", "prod")
+
+def plotted_columns(spec):
+    return [spec[key] for key in ("x", "y", "color", "size") if spec.get(key)]
+
+def hover_columns(spec, df):
+    """Columns to show on hover, limited to what the spec references"""
+    columns = (spec.get("hover_data") or plotted_columns(spec)) + [BIN_COUNT_COLUMN]
+    return [c for c in dict.fromkeys(columns) if c in df.columns]
+
+def numeric_axis(values):
+    """Values as floats for distance maths, or None for categorical axes"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    return None
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets selection of `n_out` point positions"""
+
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+
+    every = (n - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+def minmax_indices(y, n_out):
+    """Keep both endpoints plus the minimum and maximum of (n_out - 2) / 2 equal buckets"""
+
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    buckets = (n_out - 2) // 2
+    if not buckets:
+        return np.array([0, n - 1])
+
+    interior = n - 2
+    frame = pd.DataFrame({"bucket": np.arange(interior) * buckets // interior, "y": y[1:-1]})
+    grouped = frame.groupby("bucket")["y"]
+    keep = np.union1d(grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()) + 1
+    return np.union1d(keep, [0, n - 1])
+
+def downsample_series(df, spec, limit):
+    """Row positions to keep for one line series, at most `limit` of them"""
+
+    y = pd.to_numeric(df[spec["y"]], errors="coerce").to_numpy(dtype=float)
+    missing = np.isnan(y)
+    valid = np.flatnonzero(~missing)
+
+    # The first missing row after a value keeps the line's gap, as long as
+    # the gaps leave most of the budget for the values themselves
+    gaps = np.flatnonzero(missing[1:] & ~missing[:-1]) + 1
+    if len(gaps) > limit // 2:
+        gaps = gaps[:0]
+    budget = limit - len(gaps)
+
+    if spec.get("downsample", "lttb") == "minmax":
+        selected = minmax_indices(y[valid], budget)
+    else:
+        x = numeric_axis(df[spec["x"]])
+        x = np.arange(len(df), dtype=float) if x is None else x
+        selected = lttb_indices(x[valid], y[valid], budget)
+
+    return np.union1d(valid[selected], gaps)
+
+def reduce_line(df, spec):
+    limit = spec.get("max_points", LINE_MAX_POINTS)
+    color = spec.get("color")
+
+    if not color:
+        if len(df) <= limit:
+            return df
+        return df.iloc[downsample_series(df, spec, limit)]
+
+    # The limit is shared by the series; each keeps at least its two ends
+    groups = df.groupby(color, sort=False, observed=True)
+    per_series = max(limit // max(groups.ngroups, 1), 2)
+    if groups.size().max() <= per_series:
+        return df
+
+    keep = []
+    for _, positions in groups.indices.items():
+        series = df.iloc[positions]
+        keep.append(positions[downsample_series(series, spec, per_series)])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+def reduce_scatter(df, spec):
+    limit = spec.get("max_points", SCATTER_MAX_POINTS)
+    if len(df) <= limit:
+        return df
+
+    if spec.get("reduce") != "bin":
+        return df.sample(n=limit, random_state=0).sort_index()
+
+    # Average the points that fall into each cell of a grid per color,
+    # with the cells shared out so all colors together stay within the limit
+    x, y = spec["x"], spec["y"]
+    colors = df[spec["color"]].nunique() if spec.get("color") else 1
+    cells = max(int(np.sqrt(limit / max(colors, 1))), 1)
+    keys = [
+        pd.cut(df[x], cells, labels=False).rename("_x_cell"),
+        pd.cut(df[y], cells, labels=False).rename("_y_cell"),
+    ]
+    if spec.get("color"):
+        keys.append(df[spec["color"]])
+
+    agg = {x: "mean", y: "mean"}
+    if spec.get("size"):
+        agg[spec["size"]] = "mean"
+    grouped = df.groupby(keys, observed=True, sort=False)
+    binned = grouped.agg(agg)
+    binned[BIN_COUNT_COLUMN] = grouped.size()
+    return binned.reset_index().drop(columns=["_x_cell", "_y_cell"])
+
+def reduce_grouped(df, spec, names):
+    """Pre-aggregate rows sharing the same category columns"""
+
+    how = spec.get("aggregate", "sum")
+    value = spec.get("y")
+    keys = [c for c in dict.fromkeys(names) if c]
+    if not how or not value or not keys or not pd.api.types.is_numeric_dtype(df[value]):
+        return df
+    if not df.duplicated(keys).any():
+        return df
+    return df.groupby(keys, sort=False, observed=True, dropna=False)[value].agg(how).reset_index()
+
+def reduce_histogram(df, spec):
+    """Bin a large numeric histogram server-side into (bin, count) rows"""
+
+    x = spec["x"]
+    if len(df) <= spec.get("max_points", HISTOGRAM_MAX_ROWS) or not pd.api.types.is_numeric_dtype(df[x]):
+        return None
+
+    bins = np.histogram_bin_edges(df[x].dropna(), bins=spec.get("bins", HISTOGRAM_BINS))
+    centers = (bins[:-1] + bins[1:]) / 2
+    color = spec.get("color")
+    groups = df.groupby(color, sort=False, observed=True) if color else [(None, df)]
+
+    frames = []
+    for name, group in groups:
+        counts, _ = np.histogram(group[x].dropna(), bins=bins)
+        frame = pd.DataFrame({x: centers, "count": counts})
+        if color:
+            frame[color] = name
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def reduce_frame(spec, df):
+    """Return the (possibly reduced) frame to plot for a standard visual"""
+
+    chart_type = spec.get("type")
+    if chart_type == "line":
+        return reduce_line(df, spec)
+    if chart_type == "scatter":
+        return reduce_scatter(df, spec)
+    if chart_type == "bar":
+        return reduce_grouped(df, spec, [spec.get("x"), spec.get("color")])
+    if chart_type == "pie":
+        return reduce_grouped(df, spec, [spec.get("color", spec.get("x"))])
+    return df
@@ -0,0 +1,127 @@
+"""Declarative data preparation for visual specs.
+
+A visual may list a `transform` chain that turns its dataset into the frame
+that is plotted. Each step is a one-key mapping, applied in order:
+
+    transform:
+      - filter: {column: metric, op: in, value: [visits, revenue]}
+      - melt: {id_vars: [month], value_vars: [a, b], var_name: metric, value_name: pattern}
+      - group: {by: pattern, agg: size, name: count}
+      - group: {by: [platform], agg: {revenue: sum, skus: [sku_count, sum]}}
+      - pivot: {index: month, columns: metric, values: share, aggfunc: mean}
+      - top_k: {k: 10, by: revenue, per: platform}
+      - sort: {by: count, ascending: false}
+
+The plotted keys (x, y, color, ...) then refer to columns of the result.
+Results are kept in the dataset registry, under its memory budget, by
+transform chain and data file content, so a chain runs once per dataset
+version rather than on every view.
+"""
+
+import operator
+import pandas as pd
+from components.dataset_registry import dataset_registry
+from components.figure_cache import spec_key
+
+FILTER_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda series, value: series.isin(value),
+    "not in": lambda series, value: ~series.isin(value),
+}
+
+def as_list(value):
+    return [value] if isinstance(value, str) else list(value)
+
+def melt(df, args):
+    return df.melt(**args)
+
+def filter_rows(df, args):
+    """Keep rows matching every {column, op, value} condition"""
+
+    mask = pd.Series(True, index=df.index)
+    for condition in ([args] if isinstance(args, dict) else args):
+        op = FILTER_OPS[condition.get("op", "==")]
+        mask &= op(df[condition["column"]], condition["value"])
+    return df[mask]
+
+def group(df, args):
+    """Group by columns and aggregate; `agg: size` counts rows into `name`"""
+
+    by = as_list(args["by"])
+    grouped = df.groupby(by, observed=True, sort=args.get("sort", True))
+    agg = args.get("agg", "size")
+
+    if agg == "size":
+        return grouped.size().reset_index(name=args.get("name", "count"))
+    if isinstance(agg, str):
+        return grouped.agg(agg).reset_index()
+
+    # {output: function} aggregates the column of the same name,
+    # {output: [column, function]} names the input column explicitly
+    named = {
+        output: tuple(how) if isinstance(how, list) else (output, how)
+        for output, how in agg.items()
+    }
+    return grouped.agg(**named).reset_index()
+
+def pivot(df, args):
+    table = pd.pivot_table(
+        df,
+        index=args["index"],
+        columns=args["columns"],
+        values=args.get("values"),
+        aggfunc=args.get("aggfunc", "sum"),
+        observed=True,
+    ).reset_index()
+    table.columns = [
+        "_".join(str(part) for part in column if part != "") if isinstance(column, tuple) else str(column)
+        for column in table.columns
+    ]
+    return table
+
+def top_k(df, args):
+    """The k rows with the largest (or smallest) `by`, overall or per group"""
+
+    k, by = args["k"], args["by"]
+    ascending = args.get("ascending", False)
+    if args.get("per"):
+        ordered = df.sort_values(by, ascending=ascending, kind="stable")
+        return ordered.groupby(as_list(args["per"]), observed=True, sort=False).head(k)
+    return df.nsmallest(k, by) if ascending else df.nlargest(k, by)
+
+def sort(df, args):
+    return df.sort_values(args["by"], ascending=args.get("ascending", True), kind="stable")
+
+# Each step's function and the arguments it cannot run without (per
+# condition for filter); loaders/project_model.py validates specs against this
+TRANSFORMS = {
+    "melt": (melt, ()),
+    "filter": (filter_rows, ("column", "value")),
+    "group": (group, ("by",)),
+    "pivot": (pivot, ("index", "columns")),
+    "top_k": (top_k, ("k", "by")),
+    "sort": (sort, ("by",)),
+}
+
+def apply_transforms(df, steps):
+    """Run a transform chain over a frame"""
+
+    for step in steps:
+        (name, args), = step.items()
+        df = TRANSFORMS[name][0](df, args)
+    return df.reset_index(drop=True)
+
+def transformed_frame(spec, source, read):
+    """The spec's plotted frame: read(), passed through its transform chain once per data version"""
+
+    steps = spec.get("transform")
+    if not steps:
+        return read()
+
+    name = "transform:" + spec_key({"transform": steps, "columns": spec.get("columns")})
+    return dataset_registry.derived(source, name, lambda: apply_transforms(read(), steps))
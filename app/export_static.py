@@ -0,0 +1,415 @@
+"""Pre-render the whole portfolio as static HTML.
+
+    cd app
+    python export_static.py ../site
+
+The pages are produced by the same render_home / render_project_page code
+the live app runs. Streamlit is replaced in this process by a recorder that
+turns each st.* call into HTML, and Plotly figures are embedded as JSON.
+Projects render in parallel across a process pool, and a project whose
+content hash (YAML, data files, renderer sources and the catalog listed in
+the sidebar) is unchanged since the last export is skipped. Pages of
+projects no longer in the catalog are deleted.
+"""
+
+import argparse, hashlib, html, json, os, re, sys, textwrap, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+MANIFEST_NAME = "manifest.json"
+METRICS_CONFIG = "data/portfolio.yaml"
+PLOTLY_JS = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+
+# ---------------------------------------------------------------------------
+# Streamlit recorder
+# ---------------------------------------------------------------------------
+
+class Block:
+    """A container in the recorded page; st.* calls inside it add children"""
+
+    def __init__(self, recorder, kind="div", label=None, weight=1):
+        self.recorder = recorder
+        self.kind = kind
+        self.label = label
+        self.weight = weight
+        self.children = []
+
+    def __enter__(self):
+        self.recorder.stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.stack.pop()
+        return False
+
+    def __getattr__(self, name):
+        # block.markdown(...), placeholder.container(), etc. write into this block
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self.recorder, name)
+
+        def call(*args, **kwargs):
+            with self:
+                return method(*args, **kwargs)
+        return call
+
+    def html(self):
+        inner = "".join(c.html() if isinstance(c, Block) else c for c in self.children)
+        label = inline_markdown(self.label or "")
+        if self.kind == "row":
+            return f'<div class="row">{inner}</div>'
+        if self.kind == "col":
+            return f'<div class="col" style="flex:{self.weight}">{inner}</div>'
+        if self.kind == "tab":
+            return f'<section class="tab"><h2>{label}</h2>{inner}</section>'
+        if self.kind in ("expander", "popover"):
+            return f"<details><summary>{label}</summary>{inner}</details>"
+        return f"<div>{inner}</div>"
+
+class Placeholder(Block):
+    """st.empty(): each call replaces what the placeholder showed before"""
+
+    def __getattr__(self, name):
+        call = super().__getattr__(name)
+
+        def replace(*args, **kwargs):
+            self.children.clear()
+            return call(*args, **kwargs)
+        return replace
+
+class StaticStreamlit:
+    """The subset of the streamlit API used by the components, recorded as HTML"""
+
+    def __init__(self):
+        self.link_for_button = lambda label, key: None
+        self.reset()
+
+    def reset(self, query_params=None):
+        self.main = Block(self)
+        self.sidebar = Block(self, "sidebar")
+        self.stack = [self.main]
+        self.session_state = {}
+        self.query_params = dict(query_params or {})
+        self.figures = 0
+
+    def _add(self, fragment):
+        self.stack[-1].children.append(fragment)
+
+    # Page-level no-ops
+    def set_page_config(self, *args, **kwargs):
+        pass
+
+    def rerun(self):
+        pass
+
+    def get_option(self, name):
+        return None
+
+    # Text
+    def markdown(self, body, unsafe_allow_html=False, **kwargs):
+        self._add(textwrap.dedent(body) if unsafe_allow_html else markdown_to_html(body))
+
+    def write(self, *args, **kwargs):
+        self.markdown(" ".join(str(a) for a in args))
+
+    def caption(self, body, **kwargs):
+        self._add(f'<p class="caption">{inline_markdown(body)}</p>')
+
+    def _callout(self, kind, body):
+        self._add(f'<div class="callout {kind}">{inline_markdown(body)}</div>')
+
+    def info(self, body, **kwargs):
+        self._callout("info", body)
+
+    def warning(self, body, **kwargs):
+        self._callout("warning", body)
+
+    def error(self, body, **kwargs):
+        self._callout("error", body)
+
+    def success(self, body, **kwargs):
+        self._callout("success", body)
+
+    def metric(self, label, value, **kwargs):
+        self._add(
+            f'<div class="metric-container"><div>{html.escape(str(label))}</div>'
+            f'<strong>{html.escape(str(value))}</strong></div>'
+        )
+
+    # Layout
+    def _block(self, kind, label=None, weight=1):
+        block = Block(self, kind, label, weight)
+        self._add(block)
+        return block
+
+    def container(self, **kwargs):
+        return self._block("div")
+
+    def empty(self):
+        placeholder = Placeholder(self)
+        self._add(placeholder)
+        return placeholder
+
+    def columns(self, spec, **kwargs):
+        weights = [1] * spec if isinstance(spec, int) else list(spec)
+        row = self._block("row")
+        columns = [Block(self, "col", weight=w) for w in weights]
+        row.children.extend(columns)
+        return columns
+
+    def tabs(self, labels):
+        return [self._block("tab", label) for label in labels]
+
+    def expander(self, label, expanded=False, **kwargs):
+        return self._block("expander", label)
+
+    def popover(self, label, **kwargs):
+        return self._block("popover", label)
+
+    # Widgets: static pages have no interaction, so buttons become links
+    def button(self, label, key=None, **kwargs):
+        href = self.link_for_button(label, key)
+        if href:
+            self._add(f'<a class="button" href="{href}">{html.escape(label)}</a>')
+        return False
+
+    def download_button(self, *args, **kwargs):
+        return False
+
+    def radio(self, label, options, **kwargs):
+        return options[0]
+
+    def text_input(self, *args, **kwargs):
+        return ""
+
+    def multiselect(self, *args, **kwargs):
+        return []
+
+    # Data
+    def dataframe(self, df, **kwargs):
+        self._add(df.head(200).to_html(index=False, classes="dataframe", border=0))
+
+    def plotly_chart(self, fig, **kwargs):
+        self.figures += 1
+        div_id = f"figure-{self.figures}"
+        payload = fig.to_json().replace("</", "<\\/")
+        self._add(
+            f'<div id="{div_id}" class="figure"></div>'
+            f"<script>(function(){{var f={payload};"
+            f"Plotly.newPlot('{div_id}',f.data,f.layout,{{responsive:true}});}})();</script>"
+        )
+
+st = StaticStreamlit()
+
+def install_recorder():
+    """Make `import streamlit` resolve to the recorder in this process"""
+    sys.modules["streamlit"] = st
+
+# ---------------------------------------------------------------------------
+# Markdown
+# ---------------------------------------------------------------------------
+
+def inline_markdown(text):
+    text = html.escape(str(text), quote=False)
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)\s]+)\)", r'<a href="\2">\1</a>', text)
+    return text
+
+def markdown_to_html(text):
+    """Enough Markdown for the components: headings, lists, rules, paragraphs"""
+
+    out, list_tag = [], None
+    for line in textwrap.dedent(str(text)).strip().splitlines():
+        stripped = line.strip()
+        bullet = re.match(r"^[-*•]\s+(.*)", stripped)
+        numbered = re.match(r"^\d+\.\s+(.*)", stripped)
+        tag = "ul" if bullet else "ol" if numbered else None
+
+        if list_tag and tag != list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+
+        if tag:
+            if not list_tag:
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{inline_markdown((bullet or numbered).group(1))}</li>")
+        elif re.match(r"^-{3,}$", stripped):
+            out.append("<hr>")
+        elif heading := re.match(r"^(#{1,6})\s+(.*)", stripped):
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{inline_markdown(heading.group(2))}</h{level}>")
+        elif stripped:
+            out.append(f"<p>{inline_markdown(stripped)}</p>")
+
+    if list_tag:
+        out.append(f"</{list_tag}>")
+    return "".join(out)
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+PAGE_CSS = """
+body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; margin: 0; color: #1f2937; }
+.layout { display: flex; }
+aside { width: 260px; padding: 20px; background: #f8fafc; min-height: 100vh; }
+main { flex: 1; padding: 2rem; max-width: 1200px; }
+.row { display: flex; gap: 16px; }
+.col { min-width: 0; }
+.tab { border-top: 1px solid #e5e7eb; margin-top: 24px; }
+.caption { color: #6b7280; font-size: 14px; }
+.callout { padding: 12px 16px; border-radius: 8px; margin: 8px 0; }
+.callout.info { background: #eff6ff; } .callout.warning { background: #fffbeb; }
+.callout.error { background: #fef2f2; } .callout.success { background: #f0fdf4; }
+.metric-container { background: white; padding: 20px; border-radius: 10px; border: 1px solid #e5e7eb; text-align: center; }
+a.button { display: block; padding: 8px 12px; margin: 6px 0; border: 2px solid #e5e7eb; border-radius: 10px; color: #1f2937; text-decoration: none; }
+a.button:hover { border-color: #3b82f6; color: #3b82f6; }
+details { margin: 8px 0; } summary { cursor: pointer; font-weight: 600; }
+h1, h2, h3 { color: #0f172a; }
+"""
+
+def page_html(title):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<script src="{PLOTLY_JS}"></script>
+<style>{PAGE_CSS}</style>
+</head>
+<body><div class="layout"><aside>{st.sidebar.html()}</aside><main>{st.main.html()}</main></div></body>
+</html>
+"""
+
+def page_name(key):
+    return "index.html" if key is None else f"{key}.html"
+
+def button_link(label, key):
+    """Map the app's navigation buttons to static page links"""
+    if key and key.startswith(("explore_", "sidebar_")):
+        return page_name(key.split("_", 1)[1])
+    if "Portfolio Home" in label or "Back to Portfolio" in label:
+        return page_name(None)
+    return None
+
+def renderer_digest():
+    """Hash of the code that produces a page, so code changes re-render everything"""
+    digest = hashlib.sha256()
+    for path in sorted([APP_DIR / "export_static.py"] + list((APP_DIR / "components").glob("*.py"))):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def project_digest(project, code_digest, listing):
+    from components.figure_cache import file_fingerprint
+
+    files = []
+    for visual in project.visuals:
+        path = visual["data_path"]
+        files.append(file_fingerprint(path) if os.path.exists(path) else None)
+
+    payload = json.dumps([project, files, code_digest, listing], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def catalog_digest(projects):
+    """Hash of what every page's sidebar lists, so adding, removing or renaming
+    a project re-renders the other pages too"""
+    payload = json.dumps([(p.key, p.title) for p in projects])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_page(projects, render, query_params=None):
+    """Run the sidebar and a render function against a fresh recorder page"""
+    from components.layout import add_sidebar_navigation
+
+    st.reset(query_params)
+    st.link_for_button = button_link
+    add_sidebar_navigation(projects)
+    render()
+
+_worker_projects = {}
+
+def init_worker(projects_dir):
+    """Pool initializer: each worker loads the catalog once"""
+    from loaders.projects_loader import load_projects
+
+    install_recorder()
+    projects = load_projects(projects_dir)
+    _worker_projects["all"] = projects
+    _worker_projects.update((p.key, p) for p in projects)
+
+def export_project(key, out_dir):
+    """Worker: render one project page to disk"""
+    from components.layout import render_project_page
+
+    start = time.perf_counter()
+    project = _worker_projects[key]
+    render_page(
+        _worker_projects["all"],
+        lambda: render_project_page(project, lazy_tabs=False),
+        {"project": key}
+    )
+    Path(out_dir, page_name(key)).write_text(page_html(project.title), encoding="utf-8")
+    return key, time.perf_counter() - start
+
+def export_site(out_dir, projects_dir="data/projects", workers=None, force=False, metrics_config=METRICS_CONFIG):
+    """Write index.html and one page per project; returns (rendered, skipped) keys"""
+
+    install_recorder()
+    from loaders.projects_loader import load_projects
+    from loaders.portfolio_stats import PortfolioStats, load_metric_config
+    from components.layout import render_home
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+    projects = load_projects(projects_dir)
+    code_digest = renderer_digest()
+    listing = catalog_digest(projects)
+    digests = {p.key: project_digest(p, code_digest, listing) for p in projects}
+
+    stale = [
+        p for p in projects
+        if manifest.get(p.key) != digests[p.key] or not (out_dir / page_name(p.key)).exists()
+    ]
+
+    # The home page lists every project, so it is cheap enough to always rebuild
+    stats = PortfolioStats.from_projects(projects, load_metric_config(metrics_config)).summary()
+    render_page(projects, lambda: render_home(projects, stats, paginate=False))
+    (out_dir / page_name(None)).write_text(page_html("Analytics Projects Portfolio"), encoding="utf-8")
+
+    rendered = []
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(projects_dir,)) as pool:
+            keys = [p.key for p in stale]
+            for key, seconds in pool.map(export_project, keys, [str(out_dir)] * len(keys)):
+                manifest[key] = digests[key]
+                rendered.append(key)
+                print(f"rendered {key} in {seconds:.2f}s")
+
+    # Projects that left the catalog take their pages with them
+    for key in [key for key in manifest if key not in digests]:
+        (out_dir / page_name(key)).unlink(missing_ok=True)
+        del manifest[key]
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    skipped = [key for key in digests if key not in rendered]
+    return rendered, skipped
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the portfolio as static HTML")
+    parser.add_argument("out_dir")
+    parser.add_argument("--projects", default="data/projects")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--metrics", default=METRICS_CONFIG, help="portfolio metrics YAML for the overview")
+    parser.add_argument("--force", action="store_true", help="re-render every project")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rendered, skipped = export_site(args.out_dir, args.projects, args.workers, args.force, args.metrics)
+    print(f"{len(rendered)} rendered, {len(skipped)} unchanged in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,102 @@
+"""Portfolio overview numbers, maintained incrementally with the catalog.
+
+Metric categories come from an optional YAML file:
+
+    metrics:
+      - label: AI/ML Projects
+        match: [ai]
+      - label: NLP Projects
+        match: [nlp]
+
+A project counts towards a metric when any of its tags contains one of the
+`match` strings (case-insensitive).
+"""
+
+import os, threading
+import yaml
+from collections import Counter
+
+DEFAULT_METRICS = [
+    {"label": "AI/ML Projects", "match": ["ai"]},
+    {"label": "NLP Projects", "match": ["nlp"]},
+]
+
+def load_metric_config(path):
+    """Metric definitions from YAML, or the defaults when the file is absent"""
+
+    if not path or not os.path.exists(path):
+        return DEFAULT_METRICS
+    with open(path, "r", encoding="utf-8") as fh:
+        config = yaml.safe_load(fh) or {}
+    return config.get("metrics") or DEFAULT_METRICS
+
+class PortfolioStats:
+    """Tag counts and metric memberships, updated one project at a time"""
+
+    def __init__(self, metrics=None):
+        metrics = metrics or DEFAULT_METRICS
+        self.labels = [m["label"] for m in metrics]
+        self.matchers = [
+            tuple(s.lower() for s in ([m["match"]] if isinstance(m["match"], str) else m["match"]))
+            for m in metrics
+        ]
+        self.project_count = 0
+        self.tag_counts = Counter()
+        self.metric_counts = [0] * len(metrics)
+        self._flags = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_projects(cls, projects, metrics=None):
+        stats = cls(metrics)
+        for project in projects:
+            stats.update(None, project)
+        return stats
+
+    def project_flags(self, project):
+        tags = [tag.lower() for tag in project.tags]
+        return tuple(any(s in tag for s in matcher for tag in tags) for matcher in self.matchers)
+
+    def update(self, old, new):
+        """Swap one project's contribution (either side may be None)"""
+
+        with self._lock:
+            if old is not None and id(old) in self._flags:
+                _, flags = self._flags.pop(id(old))
+                self.project_count -= 1
+                self.tag_counts.subtract(old.tags)
+                self.tag_counts += Counter()  # drop zero counts
+                self.metric_counts = [c - f for c, f in zip(self.metric_counts, flags)]
+
+            if new is not None:
+                flags = self.project_flags(new)
+                # Keep a reference so the id stays unique while tracked
+                self._flags[id(new)] = (new, flags)
+                self.project_count += 1
+                self.tag_counts.update(new.tags)
+                self.metric_counts = [c + f for c, f in zip(self.metric_counts, flags)]
+
+    def summary(self, projects=None):
+        """[(label, value)] for the whole catalog or for a subset of it"""
+
+        with self._lock:
+            if projects is None:
+                total = self.project_count
+                counts = list(self.metric_counts)
+                technologies = len(self.tag_counts)
+            else:
+                total = len(projects)
+                counts = [0] * len(self.labels)
+                tags = set()
+                for project in projects:
+                    entry = self._flags.get(id(project))
+                    flags = entry[1] if entry else self.project_flags(project)
+                    counts = [c + f for c, f in zip(counts, flags)]
+                    tags.update(project.tags)
+                technologies = len(tags)
+
+        return (
+            [("Total Projects", total)]
+            + list(zip(self.labels, counts))
+            + [("Technologies", technologies)]
+        )
@@ -0,0 +1,212 @@
+"""Typed, immutable project records built from the YAML files.
+
+`parse_project(data, source)` validates a parsed YAML document and returns
+a `Project`; anything malformed raises `ProjectError`, so a bad file is
+rejected once at load time instead of failing while a page renders.
+
+Records are NamedTuples (no per-instance __dict__), lists become tuples and
+tags are interned, which keeps the catalog small in every worker process.
+Visual specs stay plain mappings because the chart code reads free-form
+keys from them; treat them as read-only.
+"""
+
+import sys
+from typing import NamedTuple, Optional
+from components.reduction import AGGREGATES, DOWNSAMPLE_METHODS, REDUCE_METHODS
+from components.transforms import FILTER_OPS, TRANSFORMS
+
+VISUAL_TYPES = ("bar", "line", "scatter", "pie", "histogram")
+RENDER_MODES = ("auto", "webgl", "svg")
+
+# Column keys each visual type plots
+PLOTTED_KEYS = {
+    "bar": ("x", "y"),
+    "line": ("x", "y"),
+    "scatter": ("x", "y"),
+    "pie": ("x", "y"),
+    "histogram": ("x",),
+}
+
+TRANSFORM_OPS = tuple(TRANSFORMS)
+
+# Optional data reduction keys (see components/reduction.py) and their values
+REDUCTION_CHOICES = {
+    "downsample": DOWNSAMPLE_METHODS,
+    "reduce": REDUCE_METHODS,
+    "aggregate": AGGREGATES,
+}
+REDUCTION_COUNTS = ("max_points", "bins")
+
+class ProjectError(ValueError):
+    """A project file that does not match the schema"""
+
+class PipelineStep(NamedTuple):
+    name: str
+    details: tuple = ()
+
+class Download(NamedTuple):
+    label: str
+    path: str
+
+class Diagram(NamedTuple):
+    type: str
+    nodes: tuple
+    edges: tuple = ()          # (source, target) pairs
+    node_styles: object = None  # raw rules, compiled by components/node_styles.py
+
+class Project(NamedTuple):
+    key: str
+    title: str
+    summary: str
+    objectives: tuple = ()
+    tags: tuple = ()
+    pipeline: tuple = ()
+    tools: tuple = ()
+    impact: tuple = ()
+    visuals: tuple = ()
+    downloads: tuple = ()
+    diagram: Optional[Diagram] = None
+    aliases: tuple = ()
+
+def _text(data, field, source, required=False):
+    value = data.get(field)
+    if value is None or value == "":
+        if required:
+            raise ProjectError(f"{source}: missing required field '{field}'")
+        return ""
+    if not isinstance(value, (str, int, float)):
+        raise ProjectError(f"{source}: '{field}' must be text")
+    return str(value)
+
+def _text_list(data, field, source):
+    values = data.get(field) or []
+    if not isinstance(values, list):
+        raise ProjectError(f"{source}: '{field}' must be a list")
+    for value in values:
+        if not isinstance(value, (str, int, float)):
+            raise ProjectError(f"{source}: '{field}' must only contain text, got {value!r}")
+    return tuple(str(value) for value in values)
+
+def _mappings(data, field, source):
+    values = data.get(field) or []
+    if not isinstance(values, list) or not all(isinstance(v, dict) for v in values):
+        raise ProjectError(f"{source}: '{field}' must be a list of mappings")
+    return values
+
+def parse_pipeline(data, source):
+    return tuple(
+        PipelineStep(_text(step, "name", f"{source} pipeline", required=True), _text_list(step, "details", source))
+        for step in _mappings(data, "pipeline", source)
+    )
+
+def check_transform_step(step, where):
+    if not isinstance(step, dict) or len(step) != 1 or next(iter(step)) not in TRANSFORM_OPS:
+        raise ProjectError(f"{where}: transform steps must be one of {', '.join(TRANSFORM_OPS)}, got {step!r}")
+
+    (name, args), = step.items()
+    # filter also takes a list of conditions, all of which must hold
+    for item in args if name == "filter" and isinstance(args, list) else [args]:
+        if not isinstance(item, dict):
+            raise ProjectError(f"{where}: '{name}' arguments must be a mapping, got {item!r}")
+        missing = [arg for arg in TRANSFORMS[name][1] if item.get(arg) is None]
+        if missing:
+            raise ProjectError(f"{where}: '{name}' needs {', '.join(missing)}")
+        if name == "filter":
+            op = item.get("op", "==")
+            if op not in FILTER_OPS:
+                raise ProjectError(f"{where}: filter op must be one of {', '.join(FILTER_OPS)}, got {op!r}")
+            if op in ("in", "not in") and not isinstance(item["value"], list):
+                raise ProjectError(f"{where}: filter op '{op}' needs a list value, got {item['value']!r}")
+
+    if name == "top_k" and (not isinstance(args["k"], int) or isinstance(args["k"], bool) or args["k"] < 1):
+        raise ProjectError(f"{where}: 'top_k' k must be a positive integer, got {args['k']!r}")
+
+def check_reduction(visual, where):
+    for key in REDUCTION_COUNTS:
+        value = visual.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise ProjectError(f"{where}: '{key}' must be a positive integer, got {value!r}")
+    for key, choices in REDUCTION_CHOICES.items():
+        value = visual.get(key)
+        # aggregate: false keeps every row
+        if value is None or (key == "aggregate" and value is False):
+            continue
+        if value not in choices:
+            raise ProjectError(f"{where}: '{key}' must be one of {', '.join(choices)}, got {value!r}")
+
+def parse_visuals(data, source):
+    visuals = _mappings(data, "visuals", source)
+    for i, visual in enumerate(visuals, 1):
+        where = f"{source} visual {i}"
+        _text(visual, "data_path", where, required=True)
+        if visual.get("type") not in VISUAL_TYPES:
+            raise ProjectError(f"{where}: 'type' must be one of {', '.join(VISUAL_TYPES)}")
+        for key in PLOTTED_KEYS[visual["type"]]:
+            _text(visual, key, f"{where} ({visual['type']})", required=True)
+        if visual.get("render_mode", "auto") not in RENDER_MODES:
+            raise ProjectError(f"{where}: 'render_mode' must be one of {', '.join(RENDER_MODES)}")
+        check_reduction(visual, where)
+        steps = visual.get("transform") or []
+        if not isinstance(steps, list):
+            raise ProjectError(f"{where}: 'transform' must be a list of steps")
+        for step in steps:
+            check_transform_step(step, where)
+    return tuple(visuals)
+
+def parse_downloads(data, source):
+    return tuple(
+        Download(_text(d, "label", f"{source} download", required=True), _text(d, "path", f"{source} download", required=True))
+        for d in _mappings(data, "downloads", source)
+    )
+
+def parse_diagram(data, source):
+    diagram = data.get("diagram")
+    if not diagram:
+        return None
+    if not isinstance(diagram, dict):
+        raise ProjectError(f"{source}: 'diagram' must be a mapping")
+
+    where = f"{source} diagram"
+    nodes = _text_list(diagram, "nodes", where)
+    known = set(nodes)
+    edges = []
+    for edge in diagram.get("edges") or []:
+        if not isinstance(edge, (list, tuple)) or len(edge) != 2:
+            raise ProjectError(f"{where}: edges must be [source, target] pairs, got {edge!r}")
+        edge = (str(edge[0]), str(edge[1]))
+        missing = [node for node in edge if node not in known]
+        if missing:
+            raise ProjectError(f"{where}: edge {list(edge)} uses unknown node(s) {', '.join(missing)}")
+        edges.append(edge)
+
+    node_styles = diagram.get("node_styles")
+    if node_styles is not None and not isinstance(node_styles, list):
+        raise ProjectError(f"{where}: 'node_styles' must be a list of rules")
+    for rule in node_styles or []:
+        if not isinstance(rule, dict) or not rule.get("match"):
+            raise ProjectError(f"{where}: node_styles rules must be mappings with a 'match' key, got {rule!r}")
+        if not isinstance(rule["match"], str):
+            _text_list(rule, "match", f"{where} node_styles")
+
+    return Diagram(_text(diagram, "type", where, required=True), nodes, tuple(edges), node_styles)
+
+def parse_project(data, source="<project>"):
+    """Validate one parsed YAML document and return a Project"""
+
+    if not isinstance(data, dict):
+        raise ProjectError(f"{source}: expected a mapping at the top level")
+
+    return Project(
+        key=sys.intern(_text(data, "key", source, required=True)),
+        title=_text(data, "title", source, required=True),
+        summary=_text(data, "summary", source, required=True),
+        objectives=_text_list(data, "objectives", source),
+        tags=tuple(sys.intern(tag) for tag in _text_list(data, "tags", source)),
+        pipeline=parse_pipeline(data, source),
+        tools=_text_list(data, "tools", source),
+        impact=_text_list(data, "impact", source),
+        visuals=parse_visuals(data, source),
+        downloads=parse_downloads(data, source),
+        diagram=parse_diagram(data, source),
+        aliases=_text_list(data, "aliases", source),
+    )
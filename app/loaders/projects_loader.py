@@ -1,9 +1,163 @@
-import yaml, os, glob
-
-def load_projects(path):
-    projects = []
-    for f in glob.glob(os.path.join(path, "*.yaml")):
-        with open(f, "r", encoding="utf-8") as fh:
-            projects.append(yaml.safe_load(fh))
-    projects.sort(key=lambda x: x.get("title",""))
-    return projects
+import yaml, os, glob, logging, threading, time
+from loaders.project_model import ProjectError, parse_project
+
+logger = logging.getLogger(__name__)
+
+# Prefer the libyaml-backed loader; it parses several times faster
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+def parse_project_file(f):
+    """Parse and validate one project YAML file; raises ProjectError if invalid"""
+    with open(f, "r", encoding="utf-8") as fh:
+        try:
+            data = yaml.load(fh, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            raise ProjectError(f"{f}: invalid YAML ({e})") from e
+    return parse_project(data, f)
+
+class ProjectCatalog:
+    """Process-wide cache of the project YAML files in one directory.
+
+    Each file is parsed once and kept together with its (mtime, size)
+    signature; later loads only re-parse files whose signature changed.
+    When a compiled snapshot is given, the first load takes unchanged
+    files from it instead of parsing YAML (see loaders/snapshot.py).
+    Files that fail validation are left out and listed in `errors` until
+    they change. Projects are immutable records (loaders/project_model.py)
+    shared by every Streamlit session in the process.
+    """
+
+    def __init__(self, path, snapshot=None):
+        self.path = path
+        self.snapshot = snapshot
+        self.version = 0
+        self.last_load = {}
+        self.errors = {}    # file -> (signature, message)
+        self._entries = {}
+        self._projects = []
+        self._derived = {}
+        self._listeners = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return the sorted project list, re-parsing only changed files"""
+
+        start = time.perf_counter()
+        hits = reparsed = from_snapshot = 0
+
+        with self._lock:
+            compiled = {}
+            if self.snapshot and not self.version:
+                # Imported here because the snapshot module reuses parse_project_file
+                from loaders import snapshot
+                compiled = snapshot.read_snapshot(self.snapshot)
+            seen = set()
+            changed = False
+
+            for f in glob.glob(os.path.join(self.path, "*.yaml")):
+                try:
+                    stat = os.stat(f)
+                except OSError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+
+                failed = self.errors.get(f)
+                if failed and failed[0] == signature:
+                    continue
+
+                cached = self._entries.get(f)
+                if cached and cached[0] == signature:
+                    seen.add(f)
+                    hits += 1
+                    continue
+
+                project = None
+                if os.path.basename(f) in compiled:
+                    project = snapshot.entry_project(compiled[os.path.basename(f)], f, signature)
+
+                if project is not None:
+                    from_snapshot += 1
+                else:
+                    try:
+                        project = parse_project_file(f)
+                    except ProjectError as e:
+                        self.errors[f] = (signature, str(e))
+                        logger.warning("Skipping invalid project file: %s", e)
+                        continue
+                    reparsed += 1
+                self.errors.pop(f, None)
+                seen.add(f)
+                self._entries[f] = (signature, project)
+                self._notify(cached[1] if cached else None, project)
+                changed = True
+
+            removed = [f for f in self._entries if f not in seen]
+            for f in removed:
+                self._notify(self._entries.pop(f)[1], None)
+            for f in [f for f in self.errors if not os.path.exists(f)]:
+                del self.errors[f]
+
+            if changed or removed or not self.version:
+                projects = [entry[1] for entry in self._entries.values()]
+                projects.sort(key=lambda x: x.title)
+                self._projects = projects
+                self.version += 1
+
+            self.last_load = {
+                "seconds": time.perf_counter() - start,
+                "files": len(seen),
+                "hits": hits,
+                "reparsed": reparsed,
+                "from_snapshot": from_snapshot,
+                "removed": len(removed),
+                "invalid": len(self.errors),
+                "version": self.version,
+            }
+            return self._projects
+
+    def attach(self, name, factory):
+        """Register a listener kept in sync with every project change.
+
+        The listener's update(old, new) is called for each added, changed
+        or removed project; it is seeded with the current projects once.
+        """
+
+        with self._lock:
+            if name not in self._listeners:
+                listener = factory()
+                for _, project in self._entries.values():
+                    listener.update(None, project)
+                self._listeners[name] = listener
+            return self._listeners[name]
+
+    def _notify(self, old, new):
+        for listener in self._listeners.values():
+            listener.update(old, new)
+
+    def derived(self, name, build):
+        """Return build(projects), computed once per catalog version"""
+
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached and cached[0] == self.version:
+                return cached[1]
+            value = build(self._projects)
+            self._derived[name] = (self.version, value)
+            return value
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(path, snapshot=None):
+    """Return the shared catalog for a projects directory"""
+    key = os.path.abspath(path)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = ProjectCatalog(path, snapshot=snapshot)
+        return _catalogs[key]
+
+def load_projects(path, snapshot=None):
+    return get_catalog(path, snapshot=snapshot).load()
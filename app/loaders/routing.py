@@ -0,0 +1,50 @@
+import logging, os
+
+logger = logging.getLogger(__name__)
+
+class ProjectRoutes:
+    """Key -> project map for deep links, checked once per catalog version.
+
+    Projects may list former keys under `aliases`; links using them resolve
+    to the current key so old URLs keep working after a rename.
+    """
+
+    def __init__(self, projects):
+        self.by_key = {}
+        self.aliases = {}
+        self.problems = []
+
+        # Required fields are already enforced by the loader (project_model.py)
+        for project in projects:
+            key = project.key
+            if key in self.by_key:
+                self.problems.append(f"{key}: duplicate key, keeping '{self.by_key[key].title}'")
+                continue
+            self.by_key[key] = project
+
+            for visual in project.visuals:
+                data_path = visual["data_path"]
+                if not os.path.exists(data_path):
+                    self.problems.append(f"{key}: data_path '{data_path}' does not exist")
+
+        for key, project in self.by_key.items():
+            for alias in project.aliases:
+                if alias in self.by_key or alias in self.aliases:
+                    self.problems.append(f"{key}: alias '{alias}' clashes with another key or alias")
+                    continue
+                self.aliases[alias] = key
+
+        for problem in self.problems:
+            logger.warning("Project catalog: %s", problem)
+
+    def resolve(self, key):
+        """(project, canonical key) for a key or alias, or (None, None)"""
+
+        project = self.by_key.get(key)
+        if project is not None:
+            return project, key
+
+        canonical = self.aliases.get(key)
+        if canonical is not None:
+            return self.by_key[canonical], canonical
+        return None, None
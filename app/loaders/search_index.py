@@ -0,0 +1,134 @@
+import re
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TERM_CACHE_SIZE = 4096
+
+# How much a match in each field counts towards a project's rank
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "summary": 1.5,
+    "objectives": 1.0,
+    "pipeline": 1.0,
+    "tools": 1.0,
+}
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+def project_fields(project):
+    """Yield (field, text) pairs that are searchable for a project"""
+    yield "title", project.title
+    yield "summary", project.summary
+    for tag in project.tags:
+        yield "tags", tag
+    for objective in project.objectives:
+        yield "objectives", objective
+    for step in project.pipeline:
+        yield "pipeline", step.name
+        for detail in step.details:
+            yield "pipeline", detail
+    for tool in project.tools:
+        yield "tools", tool
+
+class ProjectIndex:
+    """Tag bitsets and an inverted token index over a project list.
+
+    Built once per catalog version. Project ids are positions in the list,
+    so unranked results keep the catalog order.
+    """
+
+    def __init__(self, projects):
+        self.projects = list(projects)
+        self.all_ids = (1 << len(self.projects)) - 1
+        self.tag_bits = {}
+        self.postings = {}
+        self.grams = {}
+        self._term_cache = {}
+
+        for doc_id, project in enumerate(self.projects):
+            bit = 1 << doc_id
+            for tag in project.tags:
+                self.tag_bits[tag] = self.tag_bits.get(tag, 0) | bit
+
+            for field, text in project_fields(project):
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    posting = self.postings.setdefault(token, {})
+                    posting[doc_id] = posting.get(doc_id, 0.0) + weight
+
+        for token in self.postings:
+            for gram in trigrams(token):
+                self.grams.setdefault(gram, set()).add(token)
+
+        self.tags = sorted(self.tag_bits)
+
+    def matching_tokens(self, term):
+        """Vocabulary tokens containing `term`, with a match-quality factor"""
+
+        if term in self._term_cache:
+            return self._term_cache[term]
+
+        if len(term) >= 3:
+            candidates = None
+            for gram in trigrams(term):
+                tokens = self.grams.get(gram, set())
+                candidates = tokens if candidates is None else candidates & tokens
+                if not candidates:
+                    break
+        else:
+            candidates = self.postings.keys()
+
+        matches = {}
+        for token in candidates or ():
+            if token == term:
+                matches[token] = 1.0
+            elif token.startswith(term):
+                matches[token] = 0.8
+            elif term in token:
+                matches[token] = 0.5
+
+        if len(self._term_cache) >= TERM_CACHE_SIZE:
+            self._term_cache.clear()
+        self._term_cache[term] = matches
+        return matches
+
+    def search(self, query):
+        """Return {project id: score} for projects matching every query term"""
+
+        scores = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores = {}
+            for token, factor in self.matching_tokens(term).items():
+                for doc_id, weight in self.postings[token].items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + weight * factor
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                break
+
+        return scores or {}
+
+    def filter(self, tags=(), query=""):
+        """Projects having all `tags` and matching `query`, best match first"""
+
+        ids = self.all_ids
+        for tag in tags:
+            ids &= self.tag_bits.get(tag, 0)
+            if not ids:
+                return []
+
+        if not query or not tokenize(query):
+            return [p for i, p in enumerate(self.projects) if ids >> i & 1]
+
+        ranked = sorted(
+            ((score, doc_id) for doc_id, score in self.search(query).items() if ids >> doc_id & 1),
+            key=lambda hit: (-hit[0], hit[1])
+        )
+        return [self.projects[doc_id] for _, doc_id in ranked]
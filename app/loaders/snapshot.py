@@ -0,0 +1,108 @@
+"""Compiled snapshot of the project catalog.
+
+Build it once per deploy so cold starts skip YAML parsing:
+
+    cd app
+    python -m loaders.snapshot data/projects
+
+The snapshot stores every validated project together with the size, mtime and
+SHA-256 of its source file. At load time a file is taken from the snapshot
+when its stat signature or content hash still matches; anything else falls
+back to YAML. A snapshot compiled by a different version of the validation
+code (see SCHEMA_SOURCES) is ignored as a whole, since its records may not
+pass the current checks.
+"""
+
+import glob, hashlib, mmap, os, pickle, sys
+
+from components import reduction, transforms
+from loaders import project_model
+from loaders.projects_loader import parse_project_file
+
+SNAPSHOT_NAME = "_catalog.snapshot"
+SNAPSHOT_MAGIC = b"PPCAT2\n"
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+# Modules whose code decides what a valid project record is
+SCHEMA_SOURCES = (project_model, transforms, reduction)
+
+def schema_version():
+    digest = hashlib.sha256()
+    for module in SCHEMA_SOURCES:
+        with open(module.__file__, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+SCHEMA_VERSION = schema_version()
+
+def default_snapshot_path(path):
+    """Snapshot location for a projects directory"""
+    return os.path.join(path, SNAPSHOT_NAME)
+
+def file_digest(f):
+    with open(f, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+def compile_snapshot(path, out=None):
+    """Parse every project YAML in `path` and write a validated snapshot"""
+
+    out = out or default_snapshot_path(path)
+    files = {}
+
+    for f in sorted(glob.glob(os.path.join(path, "*.yaml"))):
+        stat = os.stat(f)
+        project = parse_project_file(f)
+        files[os.path.basename(f)] = {
+            "sha256": file_digest(f),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "project": project,
+        }
+
+    payload = pickle.dumps({"schema": SCHEMA_VERSION, "files": files}, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Write to a temp file first so readers never see a partial snapshot
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(SNAPSHOT_MAGIC)
+        fh.write(hashlib.sha256(payload).digest())
+        fh.write(payload)
+    os.replace(tmp, out)
+
+    return out, len(files)
+
+def read_snapshot(snapshot):
+    """Return {file name: entry} from a snapshot, or {} if missing, corrupt or
+    compiled against another schema version"""
+
+    try:
+        with open(snapshot, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header = len(SNAPSHOT_MAGIC)
+                if mm[:header] != SNAPSHOT_MAGIC:
+                    return {}
+                payload = memoryview(mm)[header + DIGEST_SIZE:]
+                try:
+                    if hashlib.sha256(payload).digest() != mm[header:header + DIGEST_SIZE]:
+                        return {}
+                    contents = pickle.loads(payload)
+                    return contents["files"] if contents.get("schema") == SCHEMA_VERSION else {}
+                finally:
+                    payload.release()
+    except (OSError, ValueError, pickle.UnpicklingError, KeyError):
+        return {}
+
+def entry_project(entry, f, signature):
+    """Project from a snapshot entry if it still matches `f`, else None"""
+
+    if entry["size"] != signature[1]:
+        return None
+    if entry["mtime_ns"] == signature[0] or entry["sha256"] == file_digest(f):
+        return entry["project"]
+    return None
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python -m loaders.snapshot PROJECTS_DIR [OUTPUT]")
+    out, count = compile_snapshot(*sys.argv[1:])
+    print(f"Compiled {count} projects into {out}")
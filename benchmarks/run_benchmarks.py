@@ -0,0 +1,250 @@
+"""Benchmarks for the catalog, filter and rendering hot paths.
+
+Generates a synthetic catalog in the same YAML/CSV schema as Data/, runs
+each hot path with Streamlit stubbed out, and writes the timings as JSON:
+
+    python benchmarks/run_benchmarks.py --projects 500 --rows 50000 --out bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json
+
+With --compare, the new run is also printed as a change against an earlier
+results file.
+"""
+
+import argparse, csv, json, platform, random, shutil, statistics, sys, tempfile, time
+from pathlib import Path
+
+import yaml
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+# Streamlit is replaced before any component is imported
+import export_static
+
+class NullStreamlit(export_static.StaticStreamlit):
+    """Recorder that discards output, so only the component logic is timed"""
+
+    def _add(self, fragment):
+        pass
+
+    def plotly_chart(self, fig, **kwargs):
+        pass
+
+    def dataframe(self, df, **kwargs):
+        pass
+
+st = NullStreamlit()
+sys.modules["streamlit"] = st
+
+from loaders.projects_loader import ProjectCatalog
+from loaders.search_index import ProjectIndex
+from components.charts import build_chart
+from components.datasets import read_dataset, spec_columns
+from components.figure_cache import figure_cache
+from components.pipeline_diagram import calculate_flow_positions, create_interactive_flow_chart
+from components.flow_layout import layered_layout
+
+WORDS = (
+    "data pipeline model scoring mapping cluster revenue lead keyword fuzzy "
+    "synonym automation ingestion validation forecast segment retail market "
+    "signal trend sentiment entity graph rank quality feature dashboard"
+).split()
+
+CHART_TYPES = ["bar", "line", "scatter"]
+
+# ---------------------------------------------------------------------------
+# Synthetic catalog
+# ---------------------------------------------------------------------------
+
+def sentence(rng, words=8):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+def write_dataset(path, rng, rows):
+    categories = [f"cat_{i}" for i in range(8)]
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["x", "y", "group", "size"])
+        for i in range(rows):
+            writer.writerow([i, round(rng.gauss(100, 25), 3), rng.choice(categories), rng.randint(1, 20)])
+
+def synthetic_diagram(rng, nodes, edges):
+    names = [f"Step {i} {rng.choice(WORDS)}" for i in range(nodes)]
+    pairs = {(names[i - 1], names[i]) for i in range(1, nodes)}
+    while len(pairs) < min(edges, nodes * (nodes - 1) // 2):
+        a, b = sorted(rng.sample(range(nodes), 2))
+        pairs.add((names[a], names[b]))
+    return {"type": "flow", "nodes": names, "edges": [list(p) for p in sorted(pairs)]}
+
+def generate_catalog(root, args):
+    """Write args.projects YAML files (and their CSVs) under root"""
+
+    rng = random.Random(args.seed)
+    projects_dir = root / "projects"
+    visuals_dir = root / "visuals"
+    projects_dir.mkdir(parents=True)
+    visuals_dir.mkdir(parents=True)
+
+    tags = [f"Tag-{i}" for i in range(args.tags)]
+
+    # A handful of shared datasets keeps generation time reasonable
+    datasets = []
+    for i in range(max(1, min(args.visuals, 5))):
+        path = visuals_dir / f"dataset_{i}.csv"
+        write_dataset(path, rng, args.rows)
+        datasets.append(str(path))
+
+    for p in range(args.projects):
+        visuals = []
+        for v in range(args.visuals):
+            chart_type = CHART_TYPES[v % len(CHART_TYPES)]
+            visuals.append({
+                "title": f"Visual {v}",
+                "type": chart_type,
+                "data_path": datasets[v % len(datasets)],
+                "x": "x" if chart_type != "bar" else "group",
+                "y": "y",
+                "color": "group",
+            })
+
+        project = {
+            "key": f"project-{p}",
+            "title": f"{sentence(rng, 3)} {p}",
+            "summary": sentence(rng, 20),
+            "objectives": [sentence(rng) for _ in range(4)],
+            "tags": rng.sample(tags, min(args.tags_per_project, len(tags))),
+            "pipeline": [{"name": sentence(rng, 3), "details": [sentence(rng)]} for _ in range(5)],
+            "tools": [rng.choice(WORDS).title() for _ in range(4)],
+            "impact": [sentence(rng) for _ in range(3)],
+            "visuals": visuals,
+            "diagram": synthetic_diagram(rng, args.nodes, args.edges),
+        }
+        with open(projects_dir / f"project_{p}.yaml", "w", encoding="utf-8") as fh:
+            yaml.safe_dump(project, fh, sort_keys=False)
+
+    return projects_dir
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def measure(results, name, fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    results[name] = {
+        "runs": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+    }
+    print(f"{name:<40} median {results[name]['median'] * 1000:10.2f} ms")
+
+def run_benchmarks(projects_dir, args):
+    results = {}
+    repeat = args.repeat
+
+    # Catalog loading: a fresh catalog parses everything, a warm one only stats files
+    measure(results, "load_projects.cold", lambda: ProjectCatalog(str(projects_dir)).load(), repeat)
+    warm = ProjectCatalog(str(projects_dir))
+    projects = warm.load()
+    measure(results, "load_projects.warm", warm.load, repeat)
+
+    # Sidebar filtering
+    measure(results, "filter.build_index", lambda: ProjectIndex(projects), repeat)
+    index = ProjectIndex(projects)
+    rng = random.Random(args.seed)
+    queries = [(rng.sample(index.tags, 2), rng.choice(WORDS)[:4]) for _ in range(50)]
+    measure(results, "filter.50_queries", lambda: [index.filter(t, q) for t, q in queries], repeat)
+
+    # Chart construction, without the figure cache
+    specs = projects[0].visuals
+    frames = [read_dataset(s["data_path"], columns=spec_columns(s)) for s in specs]
+    measure(results, "render_chart.read_data", lambda: [read_dataset(s["data_path"], columns=spec_columns(s)) for s in specs], repeat)
+    measure(results, "render_chart.build_figures", lambda: [build_chart(s, df) for s, df in zip(specs, frames)], repeat)
+
+    # Diagram layout and figure construction
+    diagram = projects[0].diagram
+    measure(
+        results,
+        "calculate_flow_positions",
+        lambda: calculate_flow_positions(diagram.nodes, diagram.edges),
+        repeat,
+        setup=layered_layout.cache_clear
+    )
+
+    # Deep diagrams stress the dummy nodes added for long edges
+    large = synthetic_diagram(random.Random(args.seed), args.large_nodes, args.large_nodes * 3 // 2)
+    measure(
+        results,
+        f"calculate_flow_positions.{args.large_nodes}_nodes",
+        lambda: calculate_flow_positions(large["nodes"], large["edges"]),
+        repeat,
+        setup=layered_layout.cache_clear
+    )
+
+    def clear_caches():
+        layered_layout.cache_clear()
+        figure_cache.clear()
+
+    measure(
+        results,
+        "create_interactive_flow_chart",
+        lambda: create_interactive_flow_chart(diagram.nodes, diagram.edges),
+        repeat,
+        setup=clear_caches
+    )
+
+    return results
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    print("\nChange against", baseline_path)
+    for name, current in results.items():
+        if name in baseline:
+            before = baseline[name]["median"]
+            change = (current["median"] - before) / before * 100 if before else 0.0
+            print(f"{name:<40} {change:+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=60)
+    parser.add_argument("--tags-per-project", type=int, default=6)
+    parser.add_argument("--visuals", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--edges", type=int, default=60)
+    parser.add_argument("--large-nodes", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="portfolio-bench-"))
+    try:
+        projects_dir = generate_catalog(root, args)
+        results = run_benchmarks(projects_dir, args)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app imports its modules relative to app/ (e.g. `from components.x import y`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
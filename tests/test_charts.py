@@ -0,0 +1,28 @@
+import logging
+
+import pandas as pd
+import pytest
+
+# The chart module renders through Streamlit; only its pure helpers are tested here
+pytest.importorskip("streamlit")
+
+from components import charts
+
+def test_malformed_webgl_threshold_falls_back_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setenv(charts.WEBGL_ENV, "lots")
+    with caplog.at_level(logging.WARNING):
+        assert charts.webgl_threshold() == charts.WEBGL_POINTS
+    assert charts.WEBGL_ENV in caplog.text
+
+def test_webgl_threshold_from_environment(monkeypatch):
+    monkeypatch.setenv(charts.WEBGL_ENV, "50")
+    assert charts.webgl_threshold() == 50
+    monkeypatch.delenv(charts.WEBGL_ENV)
+    assert charts.webgl_threshold() == charts.WEBGL_POINTS
+
+def test_render_mode_switches_above_the_threshold(monkeypatch):
+    monkeypatch.setattr(charts, "webgl_points", 10)
+    spec = {"type": "scatter", "x": "x", "y": "y"}
+    assert charts.render_mode(spec, pd.DataFrame({"x": range(11)})) == "webgl"
+    assert charts.render_mode(spec, pd.DataFrame({"x": range(10)})) == "svg"
+    assert charts.render_mode({**spec, "render_mode": "svg"}, pd.DataFrame({"x": range(11)})) == "svg"
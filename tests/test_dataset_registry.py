@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from components.dataset_registry import DatasetRegistry
+
+def write_csv(path, rows):
+    pd.DataFrame({"a": range(rows), "b": [f"row {i}" for i in range(rows)]}).to_csv(path, index=False)
+
+def test_derived_frames_count_towards_the_budget(tmp_path):
+    source = tmp_path / "data.csv"
+    write_csv(source, 1000)
+    registry = DatasetRegistry()
+    base = registry.get(source)
+    base_bytes = registry.stats()["bytes"]
+
+    registry.max_bytes = base_bytes * 2
+    for i in range(4):
+        registry.derived(source, f"copy {i}", lambda: base.copy())
+
+    stats = registry.stats()
+    assert stats["bytes"] <= registry.max_bytes
+    assert stats["evictions"] > 0
+
+def test_derived_frames_are_built_once_per_file_version(tmp_path):
+    source = tmp_path / "data.csv"
+    write_csv(source, 10)
+    registry = DatasetRegistry()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return registry.get(source).head(3)
+
+    registry.derived(source, "head", build)
+    registry.derived(source, "head", build)
+    assert len(builds) == 1
+
+    write_csv(source, 20)
+    os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 1))
+    registry.derived(source, "head", build)
+    assert len(builds) == 2
+    # The old file's frames are dropped along with it
+    assert registry.stats()["entries"] == 2
@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+import plotly.express as px
+import plotly.io as pio
+import pytest
+
+from components.figure_payload import decode_typed_array, figure_json, typed_array
+from components.instrumentation import metrics
+
+def sent_trace(fig):
+    trace = json.loads(figure_json(fig))["data"][0]
+    return {key: decode_typed_array(value) if isinstance(value, dict) and "bdata" in value else value
+            for key, value in trace.items()}
+
+def test_small_values_on_a_log_axis_survive():
+    y = np.geomspace(0.001, 5000, 50)
+    trace = sent_trace(px.scatter(x=np.arange(50), y=y, log_y=True))
+    assert (trace["y"] > 0).all()
+    np.testing.assert_allclose(trace["y"], y, rtol=1e-5)
+
+def test_small_steps_between_large_values_survive():
+    y = 1_000_000.0 + np.arange(10) / 10
+    trace = sent_trace(px.line(x=np.arange(10), y=y))
+    assert len(np.unique(trace["y"])) == 10
+    np.testing.assert_allclose(trace["y"], y, rtol=0, atol=1e-6)
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float64])
+def test_epoch_milliseconds_stay_exact(dtype):
+    x = (1.7e12 + np.arange(100) * 60_000).astype(dtype)
+    trace = sent_trace(px.line(x=x, y=np.sin(np.arange(100))))
+    assert trace["x"].dtype == np.float64
+    assert (np.diff(trace["x"]) == 60_000).all()
+
+def test_narrow_arrays_still_shrink():
+    assert typed_array(np.arange(100, dtype=np.int64))["dtype"] == "i1"
+    assert typed_array(np.linspace(0, 1, 100), axis=True)["dtype"] == "f4"
+    assert typed_array(np.linspace(0, 1, 100))["dtype"] == "f8"
+
+def test_reported_size_is_what_streamlit_sends():
+    rng = np.random.default_rng(0)
+    fig = px.scatter(x=rng.normal(size=20_000), y=rng.normal(100, 25, size=20_000))
+    before = metrics.totals()[1].get("figure_bytes_sent", 0)
+    compact = figure_json(fig)
+    reported = metrics.totals()[1]["figure_bytes_sent"] - before
+    assert reported == len(pio.to_json(pio.from_json(compact), validate=False))
@@ -0,0 +1,36 @@
+import random
+
+from components.flow_layout import MAX_EDGE_SPAN, layered_layout, split_long_edges
+
+def chain_with_shortcuts(nodes, extra, seed=0):
+    rng = random.Random(seed)
+    names = [f"n{i}" for i in range(nodes)]
+    edges = {(names[i - 1], names[i]) for i in range(1, nodes)}
+    while len(edges) < nodes - 1 + extra:
+        a, b = sorted(rng.sample(range(nodes), 2))
+        edges.add((names[a], names[b]))
+    return tuple(names), tuple(sorted(edges))
+
+def test_dummy_nodes_are_bounded_per_edge():
+    nodes, edges = chain_with_shortcuts(500, 250)
+    layer = {node: i for i, node in enumerate(nodes)}
+    short_edges, chains = split_long_edges(layer, list(edges))
+    assert len(short_edges) - len(edges) <= len(edges) * (MAX_EDGE_SPAN - 1)
+    assert all(len(chain) < MAX_EDGE_SPAN for chain in chains.values())
+
+def test_split_edges_are_routed_through_their_dummies():
+    nodes = ("a", "b", "c", "d")
+    edges = (("a", "b"), ("b", "c"), ("c", "d"), ("a", "d"))
+    layout = layered_layout(nodes, edges)
+
+    assert set(layout.positions) == set(nodes)
+    bends = layout.routes[("a", "d")]
+    # One bend per layer crossed, ordered from the source down to the target
+    assert [y for _, y in bends] == [layout.positions["b"]["y"], layout.positions["c"]["y"]]
+    assert ("a", "b") not in layout.routes
+
+def test_reversed_edges_are_routed_from_their_own_source():
+    nodes = ("a", "b", "c", "d")
+    edges = (("a", "b"), ("b", "c"), ("c", "d"), ("d", "a"))
+    bends = layered_layout(nodes, edges).routes[("d", "a")]
+    assert [y for _, y in bends] == sorted(y for _, y in bends)
@@ -0,0 +1,71 @@
+import pytest
+
+from loaders.project_model import ProjectError, parse_project
+
+def project(visuals=(), node_styles=None):
+    data = {"key": "p", "title": "P", "summary": "S", "visuals": list(visuals)}
+    if node_styles is not None:
+        data["diagram"] = {"type": "flow", "nodes": ["a"], "node_styles": node_styles}
+    return data
+
+def visual(**extra):
+    return {"type": "bar", "data_path": "data/visuals/a.csv", "x": "a", "y": "b", **extra}
+
+def test_valid_project_parses():
+    parsed = parse_project(project(
+        [visual(transform=[{"filter": [{"column": "a", "value": 1}]}, {"top_k": {"k": 3, "by": "b"}}])],
+        node_styles=[{"match": ["n8n", "orchestration"], "type": "Orchestration"}],
+    ))
+    assert parsed.diagram.node_styles[0]["type"] == "Orchestration"
+
+@pytest.mark.parametrize("spec", [
+    {"type": "histogram", "data_path": "d.csv"},
+    {"type": "pie", "data_path": "d.csv", "x": "a"},
+    {"type": "line", "data_path": "d.csv", "y": "b"},
+])
+def test_plotted_columns_are_required(spec):
+    with pytest.raises(ProjectError, match="missing required field"):
+        parse_project(project([spec]))
+
+def test_histogram_needs_no_y():
+    parse_project(project([{"type": "histogram", "data_path": "d.csv", "x": "a"}]))
+
+@pytest.mark.parametrize("step, message", [
+    ({"group": {"agg": "sum"}}, "'group' needs by"),
+    ({"top_k": {"k": 5}}, "'top_k' needs by"),
+    ({"top_k": {"by": "b"}}, "'top_k' needs k"),
+    ({"top_k": {"k": "5", "by": "b"}}, "positive integer"),
+    ({"pivot": {"index": "a"}}, "'pivot' needs columns"),
+    ({"filter": [{"column": "a"}]}, "'filter' needs value"),
+    ({"sort": "b"}, "must be a mapping"),
+    ({"filter": {"column": "a", "op": "contains", "value": "x"}}, "filter op must be one of"),
+    ({"filter": {"column": "a", "op": "in", "value": "x"}}, "needs a list value"),
+    ({"explode": {}}, "must be one of"),
+])
+def test_transform_arguments_are_checked(step, message):
+    with pytest.raises(ProjectError, match=message):
+        parse_project(project([visual(transform=[step])]))
+
+@pytest.mark.parametrize("rules", [["n8n"], [{"type": "Orchestration"}], [{"match": {"a": 1}}]])
+def test_node_style_rules_need_a_match(rules):
+    with pytest.raises(ProjectError, match="node_styles"):
+        parse_project(project(node_styles=rules))
+
+@pytest.mark.parametrize("extra, message", [
+    ({"max_points": "many"}, "'max_points' must be a positive integer"),
+    ({"max_points": 0}, "'max_points' must be a positive integer"),
+    ({"bins": 2.5}, "'bins' must be a positive integer"),
+    ({"aggregate": "bogus"}, "'aggregate' must be one of"),
+    ({"downsample": "x"}, "'downsample' must be one of"),
+    ({"reduce": "cluster"}, "'reduce' must be one of"),
+])
+def test_reduction_keys_are_checked(extra, message):
+    with pytest.raises(ProjectError, match=message):
+        parse_project(project([visual(**extra)]))
+
+def test_valid_reduction_keys_parse():
+    parse_project(project([
+        visual(aggregate=False),
+        visual(type="line", max_points=500, downsample="minmax"),
+        visual(type="scatter", reduce="bin", aggregate="mean"),
+    ]))
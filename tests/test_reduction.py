@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.reduction import minmax_indices, reduce_frame
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_line_with_missing_values_stays_within_max_points(method):
+    df = pd.DataFrame({"x": np.arange(100_000), "y": np.random.default_rng(0).normal(size=100_000)})
+    df.loc[500, "y"] = np.nan
+    df.loc[40_000:40_010, "y"] = np.nan
+
+    spec = {"type": "line", "x": "x", "y": "y", "max_points": 2000, "downsample": method}
+    reduced = reduce_frame(spec, df)
+
+    assert len(reduced) <= 2000
+    # One row per run of missing values keeps the gaps in the line
+    assert reduced["y"].isna().sum() == 2
+
+@pytest.mark.parametrize("n_out", [2, 3, 4, 5, 100, 2000])
+def test_minmax_keeps_at_most_n_out_points(n_out):
+    y = np.random.default_rng(1).normal(size=10_000)
+    keep = minmax_indices(y, n_out)
+    assert len(keep) <= n_out
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+
+def colored_frame(rows, colors, seed=2):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "x": np.arange(rows),
+        "y": rng.normal(size=rows).cumsum(),
+        "group": [f"c{i}" for i in rng.integers(0, colors, rows)],
+    })
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_colored_line_shares_max_points_across_series(method):
+    df = colored_frame(200_000, 20)
+    spec = {"type": "line", "x": "x", "y": "y", "color": "group", "max_points": 2000, "downsample": method}
+    reduced = reduce_frame(spec, df)
+    assert len(reduced) <= 2000
+    assert reduced["group"].nunique() == 20
+
+@pytest.mark.parametrize("rows, colors", [(100_000, 3), (1_000_000, 50)])
+def test_colored_binned_scatter_stays_within_max_points(rows, colors):
+    df = colored_frame(rows, colors)
+    reduced = reduce_frame({"type": "scatter", "x": "x", "y": "y", "color": "group", "reduce": "bin"}, df)
+    assert len(reduced) <= 5000
+    assert reduced["points"].sum() == rows
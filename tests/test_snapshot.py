@@ -0,0 +1,15 @@
+import shutil
+from pathlib import Path
+
+from loaders import snapshot
+
+PROJECTS = Path(__file__).resolve().parent.parent / "Data" / "projects"
+
+def test_snapshot_from_another_schema_version_is_ignored(tmp_path, monkeypatch):
+    for f in PROJECTS.glob("*.yaml"):
+        shutil.copy(f, tmp_path)
+    out, count = snapshot.compile_snapshot(str(tmp_path))
+    assert len(snapshot.read_snapshot(out)) == count > 0
+
+    monkeypatch.setattr(snapshot, "SCHEMA_VERSION", "older validation code")
+    assert snapshot.read_snapshot(out) == {}
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from components.transforms import apply_transforms
+
+SALES = pd.DataFrame({
+    "month": ["jan", "jan", "feb", "feb", "mar", "mar"],
+    "platform": ["web", "app", "web", "app", "web", "app"],
+    "revenue": [10, 4, 12, 9, 7, 15],
+    "skus": [3, 1, 4, 2, 2, 5],
+})
+
+def test_melt():
+    out = apply_transforms(SALES, [{"melt": {"id_vars": ["month"], "value_vars": ["revenue", "skus"], "var_name": "metric"}}])
+    assert list(out.columns) == ["month", "metric", "value"]
+    assert len(out) == 12
+
+def test_group_with_named_aggregates():
+    out = apply_transforms(SALES, [{"group": {"by": "platform", "agg": {"revenue": "sum", "sku_total": ["skus", "sum"]}}}])
+    assert out.set_index("platform").to_dict("index") == {
+        "app": {"revenue": 28, "sku_total": 8},
+        "web": {"revenue": 29, "sku_total": 9},
+    }
+
+def test_group_size_counts_rows():
+    out = apply_transforms(SALES, [{"group": {"by": "month", "agg": "size", "name": "rows"}}])
+    assert out["rows"].tolist() == [2, 2, 2]
+
+def test_pivot_flattens_columns():
+    out = apply_transforms(SALES, [{"pivot": {"index": "month", "columns": "platform", "values": ["revenue"]}}])
+    assert list(out.columns) == ["month", "revenue_app", "revenue_web"]
+
+def test_top_k_per_group():
+    out = apply_transforms(SALES, [{"top_k": {"k": 2, "by": "revenue", "per": "platform"}}])
+    assert sorted(zip(out["platform"], out["revenue"])) == [("app", 9), ("app", 15), ("web", 10), ("web", 12)]
+
+def test_filter_conditions_all_apply():
+    steps = [
+        {"filter": [{"column": "platform", "value": "web"}, {"column": "revenue", "op": ">=", "value": 10}]},
+        {"sort": {"by": "revenue", "ascending": False}},
+    ]
+    out = apply_transforms(SALES, steps)
+    assert out["month"].tolist() == ["feb", "jan"]
+    assert out.index.tolist() == [0, 1]
+
+def test_filter_membership():
+    out = apply_transforms(SALES, [{"filter": {"column": "month", "op": "not in", "value": ["jan", "feb"]}}])
+    assert out["month"].tolist() == ["mar", "mar"]